@@ -0,0 +1,75 @@
+"""
+Measure how fast text is encoded as CESU-8 and as Java's modified UTF-8,
+compared to Python's built-in UTF-8 codec, and to encoding one character at a
+time in Python, which is the obvious way to do it without a codec.
+
+The texts are the examples in `tests/test_cases.json` with their mojibake
+fixed, which have a few characters outside the BMP; the same with emoji added
+to every line; and the same with only the characters in the BMP, with and
+without a null at the end of each line. Run it from the top of the
+repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_cesu8_encode.py
+"""
+import json
+import os
+import timeit
+
+import ftfy.bad_codecs  # noqa: F401 (registers the codecs)
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, '..', 'tests', 'test_cases.json')
+
+
+def load_corpus():
+    with open(TEST_FILENAME, encoding='utf-8') as infile:
+        lines = [case['fixed'] for case in json.load(infile)]
+    bmp_lines = [''.join(char for char in line if char <= '\uffff') for line in lines]
+    return [
+        ('examples', '\n'.join(lines) * 20),
+        ('with emoji', ' 😍🎅🏿\n'.join(lines) * 20),
+        ('BMP only', '\n'.join(bmp_lines) * 20),
+        ('BMP only, with nulls', '\x00\n'.join(bmp_lines) * 20),
+    ]
+
+
+def encode_java_by_char(text):
+    """
+    Encode text as Java's modified UTF-8 one character at a time.
+    """
+    pieces = []
+    for char in text:
+        codept = ord(char)
+        if codept == 0:
+            pieces.append(b'\xc0\x80')
+        elif codept >= 0x10000:
+            codept -= 0x10000
+            pair = chr(0xd800 + (codept >> 10)) + chr(0xdc00 + (codept & 0x3ff))
+            pieces.append(pair.encode('utf-8', 'surrogatepass'))
+        else:
+            pieces.append(char.encode('utf-8'))
+    return b''.join(pieces)
+
+
+ENCODERS = [
+    ('utf-8', lambda text: text.encode('utf-8')),
+    ('cesu-8', lambda text: text.encode('cesu-8')),
+    ('java-utf-8', lambda text: text.encode('java-utf-8')),
+    ('java-utf-8, by character', encode_java_by_char),
+]
+
+
+def main():
+    for corpus_label, text in load_corpus():
+        assert encode_java_by_char(text) == text.encode('java-utf-8')
+        assert text.encode('java-utf-8').decode('java-utf-8') == text
+        for label, func in ENCODERS:
+            number = 2 if 'character' in label else 20
+            best = min(timeit.repeat(lambda: func(text), number=number, repeat=5))
+            print('{:<48} {:8.2f} ns/char'.format(
+                '{}, {}'.format(corpus_label, label), best / number / len(text) * 1e9
+            ))
+
+
+if __name__ == '__main__':
+    main()
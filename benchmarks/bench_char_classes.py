@@ -0,0 +1,74 @@
+"""
+Measure the memory that ftfy's table of character classes takes, and how fast
+`chars_to_classes` classifies text with it, compared to translating text with
+`CHAR_CLASS_STRING`, the class of every codepoint as one string.
+
+The corpus is the examples in `tests/test_cases.json`, the same examples with
+emoji added, and the same examples with a rare CJK character from Plane 2,
+which is outside the compact translate table and needs a second pass. Run it
+from the top of the repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_char_classes.py
+"""
+import json
+import os
+import sys
+import timeit
+
+from ftfy import chardata
+from ftfy.char_classes import PAGE_INDEX, PAGES
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, '..', 'tests', 'test_cases.json')
+
+
+def load_corpus():
+    with open(TEST_FILENAME, encoding='utf-8') as infile:
+        examples = [case['original'] for case in json.load(infile)]
+    with_emoji = [text + ' 🎅🏿' for text in examples]
+    with_plane_2 = [text + ' \U00020000' for text in examples]
+    return examples, with_emoji, with_plane_2
+
+
+def time_per_char(func, texts, repeat=5):
+    """
+    Return the best time, in nanoseconds, that `func` took per character.
+    """
+    def run():
+        for text in texts:
+            func(text)
+
+    best = min(timeit.repeat(run, number=20, repeat=repeat))
+    return best / 20 / sum(map(len, texts)) * 1e9
+
+
+def main():
+    examples, with_emoji, with_plane_2 = load_corpus()
+    full_table = chardata.CHAR_CLASS_STRING
+    for text in examples + with_emoji + with_plane_2:
+        assert chardata.chars_to_classes(text) == text.translate(full_table)
+
+    compact_size = sum(
+        map(sys.getsizeof, [chardata._build_class_table(), PAGES, PAGE_INDEX])
+    )
+    print('{:<32} {:8d} bytes'.format('full table', sys.getsizeof(full_table)))
+    print('{:<32} {:8d} bytes'.format('compact tables', compact_size))
+
+    rows = [
+        ('full table', lambda text: text.translate(full_table)),
+        ('compact tables', chardata.chars_to_classes),
+    ]
+    corpora = [
+        ('examples', examples),
+        ('with emoji', with_emoji),
+        ('with plane 2', with_plane_2),
+    ]
+    for corpus_label, texts in corpora:
+        for label, func in rows:
+            print('{:<32} {:8.2f} ns/char'.format(
+                '{}, {}'.format(corpus_label, label), time_per_char(func, texts)
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure how long ftfy takes to fix text, per line.
+
+The corpus is made from the examples in `tests/test_cases.json`, plus clean
+lines, which are most of what ftfy sees in practice. Clean lines should take
+not much longer than it takes to look at each character once, which we
+compare against by timing `len(line.encode('utf-8'))`.
+
+Run it from the top of the repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_fix_text.py
+"""
+import json
+import os
+import timeit
+
+import ftfy
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, '..', 'tests', 'test_cases.json')
+
+
+def load_corpus():
+    """
+    Get the broken examples from the test data, and the clean versions of
+    them that ftfy would output.
+    """
+    with open(TEST_FILENAME, encoding='utf-8') as infile:
+        test_data = json.load(infile)
+    broken = [case['original'] for case in test_data]
+    clean = [ftfy.fix_text(text) for text in broken]
+    return broken, clean
+
+
+def time_per_line(func, lines, repeat=5):
+    """
+    Return the best time, in microseconds, that `func` took per line.
+    """
+    def run():
+        for line in lines:
+            func(line)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(lines) * 1e6
+
+
+def main():
+    broken, clean = load_corpus()
+    ascii_clean = [line for line in clean if line.isascii()]
+    rows = [
+        ('broken lines', ftfy.fix_text, broken),
+        ('clean lines', ftfy.fix_text, clean),
+        ('clean ASCII lines', ftfy.fix_text, ascii_clean),
+        ('clean lines, just encoding', lambda s: len(s.encode('utf-8')), clean),
+    ]
+    for label, func, lines in rows:
+        print('{:<32} {:8.2f} us/line'.format(label, time_per_line(func, lines)))
+
+    # A long line of mostly clean text, with a broken example here and there
+    long_line = ' '.join(clean * 20 + broken[:10])
+    seconds = min(timeit.repeat(lambda: ftfy.fix_text(long_line), number=1, repeat=3))
+    print('{:<32} {:8.2f} ms for {} chars'.format(
+        'long mixed line', seconds * 1e3, len(long_line)
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Measure how `ftfy.fix_texts` scales with the number of worker processes.
+
+The corpus is the examples from `tests/test_cases.json`, repeated until there
+are enough of them to keep the workers busy. Run it from the top of the
+repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_fix_texts.py [max_workers]
+"""
+import json
+import os
+import sys
+import time
+
+import ftfy
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, '..', 'tests', 'test_cases.json')
+CORPUS_SIZE = 100000
+
+
+def load_corpus():
+    with open(TEST_FILENAME, encoding='utf-8') as infile:
+        examples = [case['original'] for case in json.load(infile)]
+    repeats = CORPUS_SIZE // len(examples) + 1
+    return (examples * repeats)[:CORPUS_SIZE]
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    corpus = load_corpus()
+    expected = None
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        result = list(ftfy.fix_texts(corpus, workers=workers))
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = result
+            baseline = elapsed
+        assert result == expected
+        print(
+            '{:>3} workers: {:7.2f} s  {:>9.0f} texts/s  {:5.2f}x'.format(
+                workers, elapsed, len(corpus) / elapsed, baseline / elapsed
+            )
+        )
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
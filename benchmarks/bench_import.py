@@ -0,0 +1,67 @@
+"""
+Measure how long it takes to import ftfy, and how long it takes to start using
+parts of it, each in a new Python process.
+
+ftfy builds its character tables the first time they're needed, so importing
+it should be quick, and a program that only uses `fix_line_breaks` shouldn't
+pay for the tables that `fix_encoding` uses. The import time comes from
+`python -X importtime`. Run it from the top of the repository, with this
+version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_import.py
+"""
+import re
+import subprocess
+import sys
+import time
+
+REPEAT = 10
+
+STATEMENTS = [
+    ('import ftfy', 'import ftfy'),
+    ('fix_line_breaks', 'import ftfy.fixes; ftfy.fixes.fix_line_breaks("a\\r\\nb")'),
+    ('guess_bytes', 'import ftfy; ftfy.guess_bytes(b"caf\\xc3\\xa9")'),
+    ('fix_text, clean', 'import ftfy; ftfy.fix_text("clean text")'),
+    ('fix_text, mojibake', 'import ftfy; ftfy.fix_text("schÃ¶n &amp; ﬁne")'),
+]
+
+
+def import_time():
+    """
+    Get the cumulative time, in milliseconds, that `python -X importtime`
+    reports for importing ftfy.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ftfy'],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    for line in result.stderr.decode('utf-8').splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ftfy$', line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise ValueError("importtime didn't report ftfy")
+
+
+def process_time(statement):
+    """
+    Get the time, in milliseconds, that a Python process takes to run
+    `statement`, including starting up.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', statement], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    best = min(import_time() for _ in range(REPEAT))
+    print('{:<24} {:8.2f} ms'.format('import ftfy (importtime)', best))
+    baseline = min(process_time('pass') for _ in range(REPEAT))
+    print('{:<24} {:8.2f} ms'.format('python -c pass', baseline))
+    for label, statement in STATEMENTS:
+        best = min(process_time(statement) for _ in range(REPEAT))
+        print('{:<24} {:8.2f} ms (+{:.2f})'.format(label, best, best - baseline))
+
+
+if __name__ == '__main__':
+    main()
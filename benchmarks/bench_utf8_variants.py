@@ -0,0 +1,58 @@
+"""
+Measure how long the 'utf-8-variants' codec takes to decode CESU-8 input of
+different sizes, with many surrogate pairs and Java-style nulls in it. The
+time per byte should stay the same as the input gets larger.
+
+Run it from the top of the repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_utf8_variants.py
+"""
+import codecs
+import time
+
+import ftfy.bad_codecs  # noqa: F401 (registers the codec)
+
+SIZES = [2 ** 16, 2 ** 18, 2 ** 20, 2 ** 22]
+REPEAT = 3
+
+# A line of text that has a character outside the BMP, which CESU-8 encodes
+# as a surrogate pair, and a null, which Java's variant encodes as 0xc0 0x80.
+LINE = 'Java says: Größe 😍 \x00 漢字 𝄞 done.\n'
+
+
+def cesu8(text):
+    """
+    Encode text the way Java's modified UTF-8 does, which is how the codec's
+    input usually comes about.
+    """
+    units = []
+    for char in text:
+        codept = ord(char)
+        if codept >= 0x10000:
+            codept -= 0x10000
+            units.append(chr(0xd800 + (codept >> 10)))
+            units.append(chr(0xdc00 + (codept & 0x3ff)))
+        else:
+            units.append(char)
+    encoded = ''.join(units).encode('utf-8', 'surrogatepass')
+    return encoded.replace(b'\x00', b'\xc0\x80')
+
+
+def main():
+    line = cesu8(LINE)
+    for size in SIZES:
+        data = line * (size // len(line))
+        expected = LINE * (size // len(line))
+        best = float('inf')
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            decoded = codecs.decode(data, 'utf-8-variants')
+            best = min(best, time.perf_counter() - start)
+        assert decoded == expected
+        print('{:>8d} kB {:10.1f} ms {:8.1f} ns/byte'.format(
+            len(data) // 1024, best * 1000, best / len(data) * 1e9
+        ))
+
+
+if __name__ == '__main__':
+    main()
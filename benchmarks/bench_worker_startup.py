@@ -0,0 +1,83 @@
+"""
+Measure how long `fix_texts` takes to start its worker processes, and how much
+memory each worker uses that it doesn't share with the others, with and
+without `shared_tables`, for each way that `multiprocessing` can start them.
+
+The text is short, so the time is almost all spent starting the workers. The
+memory comes from `/proc/<pid>/smaps_rollup`, so it's only measured on Linux.
+Run it from the top of the repository, with this version of ftfy importable:
+
+    PYTHONPATH=. python benchmarks/bench_worker_startup.py
+"""
+import multiprocessing
+import subprocess
+import sys
+import time
+
+from ftfy import fix_texts
+
+WORKERS = 8
+REPEAT = 3
+TEXTS = ['schÃ¶n &amp; ﬁne'] * WORKERS
+
+
+def private_memory(pid):
+    """
+    Get the memory, in kilobytes, that a process has written to and doesn't
+    share with other processes, or None if it can't be measured here.
+    """
+    try:
+        with open('/proc/{}/smaps_rollup'.format(pid)) as infile:
+            for line in infile:
+                if line.startswith('Private_Dirty:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def run(shared_tables):
+    """
+    Fix `TEXTS` in a new pool of workers. Return the time it took, in
+    milliseconds, and the average private memory of a worker.
+    """
+    start = time.perf_counter()
+    fixed = fix_texts(TEXTS, workers=WORKERS, chunksize=1, shared_tables=shared_tables)
+    next(fixed)
+    elapsed = (time.perf_counter() - start) * 1000
+    memory = [private_memory(proc.pid) for proc in multiprocessing.active_children()]
+    list(fixed)
+    if None in memory or not memory:
+        return elapsed, None
+    return elapsed, sum(memory) / len(memory)
+
+
+def measure(method, shared_tables):
+    """
+    Print the results for one start method and setting of `shared_tables`.
+    This runs in its own process, so that a forkserver started for one setting
+    isn't reused for the other.
+    """
+    multiprocessing.set_start_method(method)
+    results = [run(shared_tables) for _ in range(REPEAT)]
+    elapsed = min(result[0] for result in results)
+    memory = results[-1][1]
+    label = '{}, shared_tables={}'.format(method, shared_tables)
+    if memory is None:
+        print('{:<32} {:8.1f} ms'.format(label, elapsed))
+    else:
+        print('{:<32} {:8.1f} ms {:8.0f} kB per worker'.format(label, elapsed, memory))
+
+
+def main():
+    for method in multiprocessing.get_all_start_methods():
+        for shared_tables in [False, True]:
+            subprocess.run(
+                [sys.executable, __file__, method, str(shared_tables)], check=True
+            )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2] == 'True')
+    else:
+        main()
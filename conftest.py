@@ -0,0 +1,4 @@
+import sys
+
+# ftfy.aio, and the doctest in it, need Python 3.7
+collect_ignore = ['ftfy/aio.py'] if sys.version_info < (3, 7) else []
@@ -5,11 +5,16 @@ This is a module for making text less broken. See the `fix_text` function
 for more information.
 """
 
+import codecs
+import collections
+import functools
+import itertools
+import os
+import re
 import unicodedata
 
 import ftfy.bad_codecs
-from ftfy import fixes
-from ftfy.formatting import display_ljust
+from ftfy import chardata, fixes, profiling
 
 __version__ = '5.8'
 
@@ -32,7 +37,10 @@ def fix_text(
     remove_control_chars=True,
     remove_bom=True,
     normalization='NFC',
-    max_decode_length=10 ** 6
+    max_decode_length=10 ** 6,
+    segment_cache=None,
+    plan_cache=None,
+    propagate_plans=False
 ):
     r"""
     Given Unicode text as input, fix inconsistencies and glitches in it,
@@ -81,6 +89,11 @@ def fix_text(
       encoding or decoding Unicode text incorrectly, and fix them if they are
       reasonably fixable. See `fixes.fix_encoding` for details.
 
+      If `fix_encoding` is 'spans', then after that, each run of non-ASCII
+      characters that's left is fixed on its own, so that a line can be
+      fixed even if its parts were broken in different ways. See
+      `fixes.fix_encoding_spans`.
+
     - If `fix_entities` is True, replace HTML entities with their equivalent
       characters. If it's "auto" (the default), then consider replacing HTML
       entities, but don't do so in text where you have seen a pair of actual
@@ -138,55 +151,55 @@ def fix_text(
 
     `fix_text` will work one line at a time, with the possibility that some
     lines are in different encodings, allowing it to fix text that has been
-    concatenated together from different sources.
+    concatenated together from different sources. A line can end with any
+    kind of line break: '\n', '\r\n', '\r', U+2028, or U+2029.
 
     When it encounters lines longer than `max_decode_length` (1 million
-    codepoints by default), it will not run the `fix_encoding` step, to avoid
-    unbounded slowdowns.
+    codepoints by default), it splits them into pieces no longer than that,
+    at spaces or commas between ASCII characters, and fixes each piece on its
+    own, so that the time it takes stays linear in the length of the line. A
+    piece that can't be split that small doesn't get the `fix_encoding` step.
+
+    Text that comes from one place tends to be broken in the same way
+    throughout. With `propagate_plans=True`, when `fix_encoding` fixes a line,
+    the plan that fixed it is tried first on the lines after it. The plan is
+    only used on a line if it applies cleanly and makes the line better, as
+    measured by :func:`ftfy.badness.text_cost`, by more than the plan costs.
+    Otherwise, the line is fixed from scratch. This can fix lines that are too
+    short to be fixed on their own, but it can also go wrong on text that was
+    concatenated from sources that were broken in different ways, so it's off
+    by default.
 
     If you're certain that any decoding errors in the text would have affected
     the entire text in the same way, and you don't mind operations that scale
     with the length of the text, you can use `fix_text_segment` directly to
     fix the whole string in one batch.
-    """
-    if isinstance(text, bytes):
-        raise UnicodeError(fixes.BYTES_ERROR_TEXT)
-
-    out = []
-    pos = 0
-    while pos < len(text):
-        textbreak = text.find('\n', pos) + 1
-        fix_encoding_this_time = fix_encoding
-        if textbreak == 0:
-            textbreak = len(text)
-        if (textbreak - pos) > max_decode_length:
-            fix_encoding_this_time = False
-
-        substring = text[pos:textbreak]
-
-        if fix_entities == 'auto' and '<' in substring and '>' in substring:
-            # we see angle brackets together; this could be HTML
-            fix_entities = False
 
-        out.append(
-            fix_text_segment(
-                substring,
-                fix_entities=fix_entities,
-                remove_terminal_escapes=remove_terminal_escapes,
-                fix_encoding=fix_encoding_this_time,
-                uncurl_quotes=uncurl_quotes,
-                fix_latin_ligatures=fix_latin_ligatures,
-                fix_character_width=fix_character_width,
-                fix_line_breaks=fix_line_breaks,
-                fix_surrogates=fix_surrogates,
-                remove_control_chars=remove_control_chars,
-                remove_bom=remove_bom,
-                normalization=normalization,
-            )
-        )
-        pos = textbreak
-
-    return ''.join(out)
+    If the same lines come up many times in your text, you can pass a
+    :class:`ftfy.caching.SegmentCache` as `segment_cache`, and lines that
+    have been fixed before will be looked up in it instead of being fixed
+    again. Similarly, if many lines have been broken in the same way, you can
+    pass a :class:`ftfy.caching.PlanCache` as `plan_cache`, and the way that
+    `fix_encoding` fixed earlier lines will be tried first on later lines
+    that look like them. No cache is used by default.
+    """
+    return _get_text_fixer(
+        fix_entities,
+        remove_terminal_escapes,
+        fix_encoding,
+        fix_latin_ligatures,
+        fix_character_width,
+        uncurl_quotes,
+        fix_line_breaks,
+        fix_surrogates,
+        remove_control_chars,
+        remove_bom,
+        normalization,
+        max_decode_length,
+        segment_cache,
+        plan_cache,
+        propagate_plans,
+    ).fix_text(text)
 
 
 # Some alternate names for the main functions
@@ -209,7 +222,12 @@ def fix_file(
     fix_surrogates=True,
     remove_control_chars=True,
     remove_bom=True,
-    normalization='NFC'
+    normalization='NFC',
+    segment_cache=None,
+    plan_cache=None,
+    propagate_plans=False,
+    buffer_size=2 ** 16,
+    workers=1
 ):
     """
     Fix text that is found in a file.
@@ -219,32 +237,56 @@ def fix_file(
     have to guess what encoding it is. We'll try a few common encodings, but we
     make no promises. See the `guess_bytes` function for how this is done.
 
+    If the file has a `read` method, it's read in blocks of `buffer_size`,
+    which are decoded and fixed together, so that memory use doesn't depend on
+    the size of the file. Otherwise, we iterate over its lines.
+
+    With `workers` greater than 1, a file that has a `read` method is fixed by
+    that many worker processes, a few blocks at a time, with the same result.
+    This is how the `ftfy` command's `--jobs` option works.
+
     The output is a stream of fixed lines of text.
     """
-    entities = fix_entities
-    for line in input_file:
-        if isinstance(line, bytes):
-            if encoding is None:
-                line, encoding = guess_bytes(line)
-            else:
-                line = line.decode(encoding)
-        if fix_entities == 'auto' and '<' in line and '>' in line:
-            entities = False
-        yield fix_text_segment(
-            line,
-            fix_entities=entities,
-            remove_terminal_escapes=remove_terminal_escapes,
-            fix_encoding=fix_encoding,
-            fix_latin_ligatures=fix_latin_ligatures,
-            fix_character_width=fix_character_width,
-            uncurl_quotes=uncurl_quotes,
-            fix_line_breaks=fix_line_breaks,
-            fix_surrogates=fix_surrogates,
-            remove_control_chars=remove_control_chars,
-            remove_bom=remove_bom,
-            normalization=normalization,
+    if workers > 1 and hasattr(input_file, 'read'):
+        options = {
+            'fix_entities': fix_entities,
+            'remove_terminal_escapes': remove_terminal_escapes,
+            'fix_encoding': fix_encoding,
+            'fix_latin_ligatures': fix_latin_ligatures,
+            'fix_character_width': fix_character_width,
+            'uncurl_quotes': uncurl_quotes,
+            'fix_line_breaks': fix_line_breaks,
+            'fix_surrogates': fix_surrogates,
+            'remove_control_chars': remove_control_chars,
+            'remove_bom': remove_bom,
+            'normalization': normalization,
+            'segment_cache': segment_cache,
+            'plan_cache': plan_cache,
+            'propagate_plans': propagate_plans,
+        }
+        return _fix_file_in_parallel(
+            input_file, encoding, buffer_size, workers, options
         )
 
+    fixer = _get_text_fixer(
+        fix_entities,
+        remove_terminal_escapes,
+        fix_encoding,
+        fix_latin_ligatures,
+        fix_character_width,
+        uncurl_quotes,
+        fix_line_breaks,
+        fix_surrogates,
+        remove_control_chars,
+        remove_bom,
+        normalization,
+        10 ** 6,
+        segment_cache,
+        plan_cache,
+        propagate_plans,
+    )
+    return fixer.fix_file(input_file, encoding, buffer_size)
+
 
 def fix_text_segment(
     text,
@@ -259,7 +301,9 @@ def fix_text_segment(
     fix_surrogates=True,
     remove_control_chars=True,
     remove_bom=True,
-    normalization='NFC'
+    normalization='NFC',
+    segment_cache=None,
+    plan_cache=None
 ):
     """
     Apply fixes to text in a single chunk. This could be a line of text
@@ -268,39 +312,1271 @@ def fix_text_segment(
 
     See `fix_text` for a description of the parameters.
     """
-    if isinstance(text, bytes):
-        raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+    return _get_text_fixer(
+        fix_entities,
+        remove_terminal_escapes,
+        fix_encoding,
+        fix_latin_ligatures,
+        fix_character_width,
+        uncurl_quotes,
+        fix_line_breaks,
+        fix_surrogates,
+        remove_control_chars,
+        remove_bom,
+        normalization,
+        10 ** 6,
+        segment_cache,
+        plan_cache,
+    ).fix_text_segment(text)
+
+
+def fix_text_and_explain(
+    text,
+    *,
+    fix_entities='auto',
+    remove_terminal_escapes=True,
+    fix_encoding=True,
+    fix_latin_ligatures=True,
+    fix_character_width=True,
+    uncurl_quotes=True,
+    fix_line_breaks=True,
+    fix_surrogates=True,
+    remove_control_chars=True,
+    remove_bom=True,
+    normalization='NFC',
+    max_decode_length=10 ** 6,
+    plan_cache=None,
+    propagate_plans=False
+):
+    r"""
+    Fix text like `fix_text` does, and also say what was done to it.
+
+    Returns an `ExplainedText`: the fixed text, and a list with a
+    `LineExplanation` for each line that was changed. That has the index of
+    the line, counting from 0, and the steps that changed it, in order. Each
+    step is a pair of its name and, for 'fix_encoding', the plan that fixed
+    the encoding, in the form that :func:`ftfy.fixes.fix_encoding_and_explain`
+    returns; for other steps, it's None.
+
+        >>> fixed, explanation = fix_text_and_explain('ok\nschÃ¶n &amp; nice\n')
+        >>> print(fixed, end='')
+        ok
+        schön & nice
+        >>> for line, steps in explanation:
+        ...     for name, plan in steps:
+        ...         print(line, name, plan)
+        1 fix_encoding (('encode', 'latin-1', 0), ('decode', 'utf-8', 0))
+        1 unescape_html None
+
+    The steps are recorded as the text is fixed, so this takes about as long
+    as `fix_text`. The fixes that replace one character at a time are
+    combined into one step, called 'fix_characters', and the step that
+    applies `normalization` is called 'normalization'.
+
+    See `fix_text` for a description of the options. There's no
+    `segment_cache` option, because a cache couldn't say how the lines in it
+    were fixed.
+    """
+    return _get_text_fixer(
+        fix_entities,
+        remove_terminal_escapes,
+        fix_encoding,
+        fix_latin_ligatures,
+        fix_character_width,
+        uncurl_quotes,
+        fix_line_breaks,
+        fix_surrogates,
+        remove_control_chars,
+        remove_bom,
+        normalization,
+        max_decode_length,
+        None,
+        plan_cache,
+        propagate_plans,
+    ).fix_text_and_explain(text)
+
+
+def fix_text_edits(
+    text,
+    *,
+    fix_entities='auto',
+    remove_terminal_escapes=True,
+    fix_encoding=True,
+    fix_latin_ligatures=True,
+    fix_character_width=True,
+    uncurl_quotes=True,
+    fix_line_breaks=True,
+    fix_surrogates=True,
+    remove_control_chars=True,
+    remove_bom=True,
+    normalization='NFC',
+    max_decode_length=10 ** 6,
+    segment_cache=None,
+    plan_cache=None,
+    propagate_plans=False
+):
+    r"""
+    Find the changes that `fix_text` would make to text, without making a
+    fixed copy of it.
 
-    if fix_entities == 'auto' and '<' in text and '>' in text:
-        fix_entities = False
-    while True:
-        origtext = text
-        if remove_terminal_escapes:
-            text = fixes.remove_terminal_escapes(text)
-        if fix_encoding:
-            text = fixes.fix_encoding(text)
+    Returns a list of edits, in order, that don't overlap. Each edit is a
+    tuple of `(start, end, replacement)`, which means that `text[start:end]`
+    should be replaced with `replacement`. If nothing needs to change, the
+    list is empty.
+
+        >>> text = 'Plain text\nthen schÃ¶n\nand &lt;3\n'
+        >>> fix_text_edits(text)
+        [(19, 21, 'ö'), (27, 31, '<')]
+
+    Edits can be made to a copy of the text, or to wherever it's stored,
+    working from the end so that the positions of earlier edits don't move:
+
+        >>> for start, end, replacement in reversed(fix_text_edits(text)):
+        ...     text = text[:start] + replacement + text[end:]
+        >>> text
+        'Plain text\nthen schön\nand <3\n'
+
+    There's at most one edit for each line, which covers the part of the line
+    from the first character that changed to the last one. Lines that don't
+    change aren't copied. See `fix_text` for a description of the options.
+    """
+    return _get_text_fixer(
+        fix_entities,
+        remove_terminal_escapes,
+        fix_encoding,
+        fix_latin_ligatures,
+        fix_character_width,
+        uncurl_quotes,
+        fix_line_breaks,
+        fix_surrogates,
+        remove_control_chars,
+        remove_bom,
+        normalization,
+        max_decode_length,
+        segment_cache,
+        plan_cache,
+        propagate_plans,
+    ).fix_text_edits(text)
+
+
+# The result of `fix_text_and_explain`
+ExplainedText = collections.namedtuple('ExplainedText', ['text', 'explanation'])
+
+# How `fix_text_and_explain` changed one line: the index of the line, and a
+# list of (step name, encoding plan or None) pairs
+LineExplanation = collections.namedtuple('LineExplanation', ['line', 'steps'])
+
+
+# A step that TextFixer can apply to text. `may_change` is a quick check that
+# returns False if `function` definitely wouldn't change a string, or it's None
+# if there's no quicker way to find out than running `function`. An
+# `idempotent` step never changes its own output.
+_FixStep = collections.namedtuple(
+    '_FixStep', ['name', 'function', 'may_change', 'idempotent']
+)
+
+
+def _contains(substring):
+    """
+    Make a quick check for whether a string contains `substring`.
+    """
+    def contains(text):
+        "Check whether this text contains the substring."
+        return substring in text
+
+    return contains
+
+
+class TextFixer:
+    """
+    A reusable object that fixes text with a particular set of options.
+
+    `fix_text`, `fix_text_segment` and `fix_file` take the same keyword
+    options that TextFixer does, and they use a TextFixer to do their work.
+    If you're going to fix a lot of text with the same options, you can
+    make one TextFixer and call its methods directly, so that the options are
+    only looked at once:
+
+        >>> fixer = TextFixer(uncurl_quotes=False)
+        >>> print(fixer.fix_text('&ldquo;ﬂuﬃ ＴＥＸＴ&rdquo;'))
+        “fluffi TEXT”
+
+    See `fix_text` for a description of the options.
+
+    A TextFixer combines the fixes that replace one character at a time --
+    `fix_latin_ligatures`, `fix_character_width`, `uncurl_quotes`,
+    `fix_line_breaks` and `remove_control_chars` -- into one function that
+    makes a single pass over the text, using
+    :func:`ftfy.fixes.make_character_fixer`. The result is the same as
+    running those fixes separately.
+
+    Before running any steps, a TextFixer checks whether the text contains
+    anything that one of them could change. Most text doesn't, and that text
+    is returned as the same object that was passed in.
+
+    A TextFixer does not change after it's created, so it's safe to share
+    between threads. (If it has a `segment_cache` or a `plan_cache`, those
+    caches change, but they're safe to share between threads too.)
+    """
+
+    def __init__(
+        self,
+        *,
+        fix_entities='auto',
+        remove_terminal_escapes=True,
+        fix_encoding=True,
+        fix_latin_ligatures=True,
+        fix_character_width=True,
+        uncurl_quotes=True,
+        fix_line_breaks=True,
+        fix_surrogates=True,
+        remove_control_chars=True,
+        remove_bom=True,
+        normalization='NFC',
+        max_decode_length=10 ** 6,
+        segment_cache=None,
+        plan_cache=None,
+        propagate_plans=False
+    ):
+        self.fix_entities = fix_entities
+        self.remove_terminal_escapes = remove_terminal_escapes
+        self.fix_encoding = fix_encoding
+        self.fix_latin_ligatures = fix_latin_ligatures
+        self.fix_character_width = fix_character_width
+        self.uncurl_quotes = uncurl_quotes
+        self.fix_line_breaks = fix_line_breaks
+        self.fix_surrogates = fix_surrogates
+        self.remove_control_chars = remove_control_chars
+        self.remove_bom = remove_bom
+        self.normalization = normalization
+        self.max_decode_length = max_decode_length
+        self.segment_cache = segment_cache
+        self.plan_cache = plan_cache
+        self.propagate_plans = propagate_plans
+
+        self._character_fixes = tuple(
+            name for name in fixes.CHARACTER_FIXES if getattr(self, name)
+        )
+        self._fix_characters = fixes.make_character_fixer(self._character_fixes)
+
+        # Segments in a shared segment cache are keyed on the options that
+        # could affect how they're fixed.
+        self._cache_key = (
+            remove_terminal_escapes,
+            self._character_fixes,
+            fix_surrogates,
+            remove_bom,
+            normalization,
+            plan_cache is not None,
+        )
+
+        # The steps depend on whether `fix_encoding` and `fix_entities` are
+        # turned on for a particular segment, so we keep a pipeline for each
+        # combination that comes up.
+        self._pipelines = {}
+        _, self._needs_fixing = self._get_pipeline(fix_encoding, fix_entities)
+
+        # What `_fix_lines_of_text` needs to know about the text that came
+        # before: the value of `fix_entities`, and the last plan that fixed
+        # the encoding of a line
+        self._initial_state = (fix_entities, None)
+
+    def _get_pipeline(self, fix_encoding, fix_entities):
+        """
+        Get the list of functions that make up one pass of fixing a segment,
+        plus a function that checks whether any of them could change a string.
+        """
+        key = (_encoding_mode(fix_encoding), bool(fix_entities))
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            steps = []
+            if self.remove_terminal_escapes:
+                steps.append(
+                    _FixStep(
+                        'remove_terminal_escapes',
+                        fixes.remove_terminal_escapes,
+                        _contains('\x1b'),
+                        False,
+                    )
+                )
+            if fix_encoding:
+                fix_encoding_function = fixes.fix_encoding
+                if fix_encoding == 'spans':
+                    fix_encoding_function = fixes.fix_encoding_spans
+                if self.plan_cache is not None:
+                    fix_encoding_function = functools.partial(
+                        fix_encoding_function, plan_cache=self.plan_cache
+                    )
+                steps.append(
+                    _FixStep(
+                        'fix_encoding',
+                        fix_encoding_function,
+                        chardata.MOJIBAKE_TRIGGER_RE.search,
+                        False,
+                    )
+                )
+            if fix_entities:
+                steps.append(
+                    _FixStep('unescape_html', fixes.unescape_html, _contains('&'), False)
+                )
+            # Surrogates can be fixed before the character fixes instead of
+            # after them, because the character fixes never produce or remove
+            # surrogates. This lets `remove_control_chars` see the characters
+            # that surrogate pairs turned into.
+            if self.fix_surrogates:
+                steps.append(
+                    _FixStep('fix_surrogates', fixes.fix_surrogates, None, True)
+                )
+            if self._fix_characters is not None:
+                table = fixes.character_fix_table(self._character_fixes)
+                steps.append(
+                    _FixStep(
+                        'fix_characters',
+                        self._fix_characters,
+                        chardata.char_class_regex(map(chr, table)).search,
+                        True,
+                    )
+                )
+            if self.remove_bom and not self.remove_control_chars:
+                # Skip this step if we've already done `remove_control_chars`,
+                # because it would be redundant.
+                steps.append(_FixStep('remove_bom', fixes.remove_bom, None, True))
+            if self.normalization is not None:
+                steps.append(
+                    _FixStep(
+                        'normalization',
+                        functools.partial(unicodedata.normalize, self.normalization),
+                        None,
+                        True,
+                    )
+                )
+            pipeline = (steps, self._make_detector(fix_encoding, fix_entities))
+            self._pipelines[key] = pipeline
+        return pipeline
+
+    def _make_detector(self, fix_encoding, fix_entities):
+        """
+        Make a function that quickly checks whether any step of the pipeline
+        could change a string. Most text doesn't need fixing, and this lets us
+        return it as it is without running any of the steps.
+
+        Each step only ever changes text that contains certain characters, so
+        we look for any of those characters with a single regex. ASCII text
+        gets a smaller regex, and it's already normalized.
+        """
+        chars = []
+        if self.remove_terminal_escapes:
+            chars.append('\x1b')
+        if self.fix_surrogates:
+            chars.append(''.join(map(chr, range(0xd800, 0xe000))))
+        if self._character_fixes:
+            table = fixes.character_fix_table(self._character_fixes)
+            chars.append(''.join(map(chr, table)))
+        if self.remove_bom and not self.remove_control_chars:
+            chars.append('\ufeff')
+        chars = ''.join(chars)
+        ascii_chars = ''.join(char for char in chars if char < '\x80')
+
+        # Some steps need more than one character to look at, so they get
+        # their own alternatives in the regex.
+        ascii_patterns = []
         if fix_entities:
-            text = fixes.unescape_html(text)
-        if fix_latin_ligatures:
-            text = fixes.fix_latin_ligatures(text)
-        if fix_character_width:
-            text = fixes.fix_character_width(text)
-        if uncurl_quotes:
-            text = fixes.uncurl_quotes(text)
-        if fix_line_breaks:
-            text = fixes.fix_line_breaks(text)
-        if fix_surrogates:
-            text = fixes.fix_surrogates(text)
-        if remove_control_chars:
-            text = fixes.remove_control_chars(text)
-        if remove_bom and not remove_control_chars:
-            # Skip this step if we've already done `remove_control_chars`,
-            # because it would be redundant.
-            text = fixes.remove_bom(text)
-        if normalization is not None:
-            text = unicodedata.normalize(normalization, text)
-        if text == origtext:
+            ascii_patterns.append(chardata.HTML_ENTITY_RE.pattern)
+        if ascii_chars:
+            ascii_patterns.append(chardata.char_class_regex(ascii_chars).pattern)
+        patterns = list(ascii_patterns)
+        if chars:
+            patterns.append(chardata.char_class_regex(chars).pattern)
+        if fix_encoding:
+            # `fix_encoding` leaves ASCII alone.
+            patterns.append(chardata.MOJIBAKE_TRIGGER_RE.pattern)
+        ascii_re = re.compile('|'.join(ascii_patterns)) if ascii_patterns else None
+        any_re = re.compile('|'.join(patterns)) if patterns else None
+        normalization = self.normalization
+        is_ascii = chardata.is_ascii
+        is_normalized = chardata.is_normalized
+
+        def needs_fixing(text):
+            "Check whether any step could change this text."
+            if is_ascii(text):
+                return ascii_re is not None and ascii_re.search(text) is not None
+            if any_re is not None and any_re.search(text) is not None:
+                return True
+            return normalization is not None and not is_normalized(
+                normalization, text
+            )
+
+        return needs_fixing
+
+    def fix_text(self, text):
+        """
+        Fix text, one line at a time. This works like :func:`ftfy.fix_text`
+        with this TextFixer's options.
+        """
+        if isinstance(text, bytes):
+            raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+
+        return self._fix_lines_of_text(
+            text, self._initial_state, self.max_decode_length
+        )[0]
+
+    def fix_text_and_explain(self, text):
+        """
+        Fix text, one line at a time, and say what was done to it. This works
+        like :func:`ftfy.fix_text_and_explain` with this TextFixer's options,
+        except that lines aren't looked up in its `segment_cache`.
+        """
+        if isinstance(text, bytes):
+            raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+
+        explanation = []
+        fixed = self._fix_lines_of_text(
+            text, self._initial_state, self.max_decode_length, explanation
+        )[0]
+        return ExplainedText(fixed, explanation)
+
+    def fix_text_edits(self, text):
+        """
+        Find the edits that would fix text, one line at a time. This works
+        like :func:`ftfy.fix_text_edits` with this TextFixer's options.
+        """
+        if isinstance(text, bytes):
+            raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+
+        edits = []
+        self._fix_lines_of_text(
+            text, self._initial_state, self.max_decode_length, edits=edits
+        )
+        return edits
+
+    def fix_text_segment(self, text):
+        """
+        Fix text in a single chunk. This works like
+        :func:`ftfy.fix_text_segment` with this TextFixer's options.
+        """
+        if isinstance(text, bytes):
+            raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+        return self._fix_segment(text, self.fix_encoding, self.fix_entities)[0]
+
+    def fix_file(self, input_file, encoding=None, buffer_size=2 ** 16):
+        """
+        Fix text that is found in a file, yielding fixed lines. This works
+        like :func:`ftfy.fix_file` with this TextFixer's options.
+        """
+        if hasattr(input_file, 'read'):
+            for fixed in self._fix_file_blocks(input_file, encoding, buffer_size):
+                yield from _LINE_RE.findall(fixed)
+        else:
+            yield from self._fix_file_lines(input_file, encoding)
+
+    def _fix_file_blocks(self, input_file, encoding, buffer_size):
+        """
+        Read a file in blocks of `buffer_size`, yielding blocks of fixed text.
+
+        Each block is decoded, if it's bytes, and the complete lines in it
+        are fixed together.
+        """
+        state = self._initial_state
+        decoder = _LineDecoder(encoding)
+        read = getattr(input_file, 'read1', input_file.read)
+        for chunk in iter(functools.partial(read, buffer_size), input_file.read(0)):
+            text = decoder.decode(chunk)
+            if text:
+                fixed, state = self._fix_lines_of_text(text, state, None)
+                yield fixed
+            if decoder.error is not None:
+                raise decoder.error
+
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield self._fix_lines_of_text(text, state, None)[0]
+        if decoder.error is not None:
+            raise decoder.error
+
+    def _fix_file_lines(self, input_file, encoding):
+        """
+        Iterate over the lines of a file, yielding each line fixed.
+        """
+        entities = self.fix_entities
+        plan = None
+        for line in _decode_lines(input_file, encoding):
+            if entities == 'auto' and '<' in line and '>' in line:
+                entities = False
+            fixed, plan = self._fix_segment(line, self.fix_encoding, entities, plan)
+            yield fixed
+
+    def _fix_lines_of_text(
+        self, text, state, max_decode_length, explanation=None, edits=None
+    ):
+        """
+        Fix a string one line at a time, the way `fix_text` does. Lines longer
+        than `max_decode_length`, if it's not None, are fixed in pieces; see
+        `_split_long_line`.
+
+        The `state` says what we know from the text before this string: it's
+        a tuple of the value of `fix_entities` to use, and the plan that last
+        fixed the encoding of a line, if any. When `fix_entities` is 'auto',
+        it changes to False once we've seen a line that looks like HTML.
+
+        If `explanation` is a list, a `LineExplanation` is added to it for
+        each line that was changed. If `edits` is a list, the changes are
+        added to it as (start, end, replacement) edits instead of being put
+        together into a new string, and the text is returned as it was.
+
+        Returns the fixed text, and the state for any text that comes after it.
+        """
+        fix_entities, plan = state
+        if not self._needs_fixing(text) and (plan is None or chardata.is_ascii(text)):
+            # None of the lines need fixing, but we still need to know if one
+            # of them looked like HTML.
+            if fix_entities == 'auto' and '<' in text and '>' in text:
+                for line in _LINE_BREAK_RE.split(text):
+                    if '<' in line and '>' in line:
+                        fix_entities = False
+                        break
+            return text, (fix_entities, plan)
+
+        out = []
+        pos = line = 0
+        textbreaks = itertools.chain(
+            (match.end() for match in _LINE_BREAK_RE.finditer(text)), [len(text)]
+        )
+        line_steps = None
+        for textbreak in textbreaks:
+            if textbreak == pos:
+                continue
+            substring = text[pos:textbreak]
+            if explanation is not None:
+                line_steps = []
+
+            if fix_entities == 'auto' and '<' in substring and '>' in substring:
+                # we see angle brackets together; this could be HTML
+                fix_entities = False
+
+            if max_decode_length is not None and len(substring) > max_decode_length:
+                pieces = _split_long_line(substring, max_decode_length)
+            else:
+                pieces = [(substring, True)]
+            for piece, can_decode in pieces:
+                fixed, plan = self._fix_segment(
+                    piece,
+                    self.fix_encoding if can_decode else False,
+                    fix_entities,
+                    plan,
+                    line_steps,
+                )
+                if edits is None:
+                    out.append(fixed)
+                elif fixed != piece:
+                    edits.append(_make_edit(pos, piece, fixed))
+                pos += len(piece)
+            if line_steps:
+                explanation.append(LineExplanation(line, line_steps))
+            line += 1
+
+        if edits is not None:
+            return text, (fix_entities, plan)
+        return ''.join(out), (fix_entities, plan)
+
+    def _fix_segment(
+        self, text, fix_encoding, fix_entities, plan=None, explanation=None
+    ):
+        """
+        Apply all the steps to a segment of text, repeating them until they
+        stop changing it.
+
+        `plan` is the plan that last fixed the encoding of a segment before
+        this one. Returns the fixed text, and the plan that the segment after
+        it should try first. If `explanation` is a list, the steps that
+        changed the text are added to it, and the cache isn't used.
+
+        Text that none of the steps could change is returned as it is. If
+        there's a `segment_cache`, other segments that aren't too long are
+        looked up in it, keyed on the segment, the plan and the options.
+        """
+        if fix_entities == 'auto' and '<' in text and '>' in text:
+            fix_entities = False
+        steps, needs_fixing = self._get_pipeline(fix_encoding, fix_entities)
+        if not needs_fixing(text):
+            # If we have a plan, it's worth trying on any text that isn't
+            # ASCII, even if it doesn't look like it needs fixing.
+            if plan is None or not fix_encoding or chardata.is_ascii(text):
+                return text, plan
+
+        cache = self.segment_cache
+        if explanation is not None:
+            return self._run_steps_with_plan(
+                text, steps, fix_encoding, plan, explanation
+            )
+        if cache is None or len(text) > cache.max_length:
+            return self._run_steps_with_plan(text, steps, fix_encoding, plan)
+        key = (
+            self._cache_key,
+            _encoding_mode(fix_encoding),
+            bool(fix_entities),
+            plan,
+            text,
+        )
+        result = cache.get(key)
+        if result is None:
+            result = self._run_steps_with_plan(text, steps, fix_encoding, plan)
+            cache.put(key, result, len(text) + len(result[0]))
+        return result
+
+    def _run_steps_with_plan(self, text, steps, fix_encoding, plan, explanation=None):
+        """
+        Run the steps on a segment, like `_run_steps`. If `propagate_plans`
+        is on, the first time `fix_encoding` runs, it tries `plan` first, and
+        we keep track of the last plan that it used for the next segment.
+
+        The plan is only tried once, because it came from earlier segments.
+        Trying it again on text it already fixed could fix it twice.
+
+        With `fix_encoding='spans'`, plans aren't passed on, because the point
+        is to fix parts of the text in different ways.
+
+        If `explanation` is a list, we add a (name, plan) pair to it for each
+        step that changes the text, where the plan is how `fix_encoding`
+        fixed it, or None for other steps and for fixing spans.
+        """
+        propagate = (
+            fix_encoding and self.propagate_plans and fix_encoding != 'spans'
+        )
+        if not propagate and explanation is None:
+            return self._run_steps(text, steps), plan
+        plan_cache = self.plan_cache
+        looks_like_mojibake = chardata.MOJIBAKE_TRIGGER_RE.search
+        last_plan = plan
+        # The plan gets tried even if the segment doesn't look like mojibake
+        untried = propagate and plan is not None
+        # The plans that changed the text, in order, for the explanation
+        plans_used = []
+
+        def may_need_fixing(text):
+            "Check whether there's a plan to try, or mojibake to look for."
+            return untried or looks_like_mojibake(text)
+
+        def fix_encoding_step(text):
+            "Fix the encoding of text, also trying the last plan."
+            nonlocal last_plan, untried
+            if fix_encoding == 'spans':
+                fixed = fixes.fix_encoding_spans(text, plan_cache)
+                new_plan = None
+            else:
+                fixed, new_plan = fixes.fix_encoding_and_explain(
+                    text, plan_cache, plan if untried else None
+                )
+            untried = False
+            # Only plans that re-decode the whole text as UTF-8 are passed on.
+            # The others fix something local, such as stray UTF-8 punctuation,
+            # or they're fallbacks that the search only settles for when
+            # nothing better works, and trying them first would get in the
+            # way of better fixes.
+            if propagate and _is_utf8_plan(new_plan):
+                last_plan = tuple(new_plan)
+            if fixed != text:
+                plans_used.append(None if new_plan is None else tuple(new_plan))
+            return fixed
+
+        steps = [
+            step._replace(
+                function=fix_encoding_step,
+                may_change=may_need_fixing if propagate else step.may_change,
+            )
+            if step.name == 'fix_encoding'
+            else step
+            for step in steps
+        ]
+        if explanation is None:
+            return self._run_steps(text, steps), last_plan
+
+        names = []
+        fixed = self._run_steps(text, steps, names)
+        plans_used = iter(plans_used)
+        explanation.extend(
+            (name, next(plans_used) if name == 'fix_encoding' else None)
+            for name in names
+        )
+        return fixed, last_plan
+
+    @staticmethod
+    def _run_steps(text, steps, changed_by=None):
+        """
+        Run the steps of a pipeline on a segment until they stop changing it.
+        If `changed_by` is a list, the name of each step that changes the
+        text is added to it.
+
+        We keep track of which steps have already seen the current text. When
+        a step changes the text, the other steps need to look at it again,
+        but the step itself doesn't if it's idempotent. Steps that come up
+        again are skipped if their quick check says there's nothing for them
+        to do. This gives the same result as running every step on every
+        pass, until a pass changes nothing.
+
+        If there's an active :class:`ftfy.profiling.Profile`, it records what
+        the steps do.
+        """
+        profile = profiling._active
+        if profile is not None:
+            profile.segments += 1
+        pending = [True] * len(steps)
+        while True in pending:
+            if profile is not None:
+                profile.passes += 1
+            for i, step in enumerate(steps):
+                if not pending[i]:
+                    continue
+                pending[i] = False
+                if step.may_change is not None and not step.may_change(text):
+                    continue
+                if profile is None:
+                    fixed = step.function(text)
+                else:
+                    fixed = profile.run_step(step, text)
+                if fixed != text:
+                    text = fixed
+                    if changed_by is not None:
+                        changed_by.append(step.name)
+                    pending = [True] * len(steps)
+                    pending[i] = not step.idempotent
+        return text
+
+
+def _encoding_mode(fix_encoding):
+    """
+    Get the value of `fix_encoding` that matters for choosing the steps:
+    'spans', or True or False.
+    """
+    if fix_encoding == 'spans':
+        return fix_encoding
+    return bool(fix_encoding)
+
+
+def _is_utf8_plan(plan):
+    """
+    Check whether a plan for fixing the encoding of text encodes it and then
+    decodes it as UTF-8.
+    """
+    return (
+        len(plan) >= 2
+        and plan[0][0] == 'encode'
+        and plan[-1][:2] in (('decode', 'utf-8'), ('decode', 'utf-8-variants'))
+    )
+
+
+# Places where a long line can be split, and the pieces fixed separately,
+# without changing the result much: runs of spaces or tabs, or a comma, between
+# printable ASCII characters. ASCII characters other than spaces can't be part
+# of mojibake, and these characters don't appear in HTML entities or terminal
+# escapes, and don't combine with the characters around them when normalized.
+_LONG_LINE_BREAK_RE = re.compile('(?<=[!-~])(?:[ \t]+|,)(?=[!-~])')
+
+
+def _make_edit(start, old, new):
+    """
+    Make a (start, end, replacement) edit that changes the text `old`, which
+    starts at position `start`, into `new`. The edit leaves out the parts at
+    the start and end that are the same in both.
+    """
+    prefix, suffix = _common_affixes(old, new)
+    return (start + prefix, start + len(old) - suffix, new[prefix:len(new) - suffix])
+
+
+def _common_affixes(old, new):
+    """
+    Get the lengths of the prefix and the suffix that `old` and `new` have in
+    common, where the suffix doesn't overlap the prefix in either string.
+
+        >>> _common_affixes('schÃ¶n', 'schön')
+        (3, 1)
+        >>> _common_affixes('aaa', 'aa')
+        (2, 0)
+    """
+    limit = min(len(old), len(new))
+    prefix = _match_length(
+        lambda pos, size: old[pos:pos + size] == new[pos:pos + size], limit
+    )
+    old_end, new_end = len(old), len(new)
+    suffix = _match_length(
+        lambda pos, size: (
+            old[old_end - pos - size:old_end - pos]
+            == new[new_end - pos - size:new_end - pos]
+        ),
+        limit - prefix,
+    )
+    return prefix, suffix
+
+
+def _match_length(same, limit):
+    """
+    Find how many characters two strings have in common, up to `limit`, where
+    `same(pos, size)` says whether the `size` characters starting at `pos`
+    match. Strings can be long and have long parts in common, so this compares
+    slices that double in size until one doesn't match, then halves the size
+    to find where it stops matching.
+    """
+    pos = 0
+    size = 1
+    while size <= limit - pos and same(pos, size):
+        pos += size
+        size *= 2
+    size = min(size, limit - pos)
+    while size > 1:
+        half = size // 2
+        if same(pos, half):
+            pos += half
+            size -= half
+        else:
+            size = half
+    if size == 1 and same(pos, 1):
+        pos += 1
+    return pos
+
+
+def _split_long_line(text, max_length):
+    """
+    Split a line of text that's longer than `max_length` into pieces that
+    aren't, at the places that `_LONG_LINE_BREAK_RE` finds, taking as much
+    text as possible in each piece. Yields each piece, and whether it's short
+    enough to decode.
+
+    If there's more than `max_length` of text between two places where we
+    can split it, that piece of text is yielded whole, and isn't short enough
+    to decode.
+    """
+    start = end_so_far = 0
+    breaks = itertools.chain(
+        (match.end() for match in _LONG_LINE_BREAK_RE.finditer(text)), [len(text)]
+    )
+    for end in breaks:
+        if end - start > max_length:
+            if end_so_far > start:
+                yield text[start:end_so_far], True
+                start = end_so_far
+            if end - start > max_length:
+                yield text[start:end], False
+                start = end
+        end_so_far = end
+    if start < len(text):
+        yield text[start:], True
+
+
+# The line breaks that `fix_text` splits text at. This doesn't include U+0085,
+# which `fix_encoding` usually finds to be a mis-decoded "…", or part of some
+# other mojibake, such as 'Ã\x85' for 'Å'.
+_LINE_BREAK_RE = re.compile('\r\n?|[\n\u2028\u2029]')
+
+# Splits text into lines that end with one of those line breaks, except
+# possibly the last one
+_LINE_RE = re.compile(
+    '[^\r\n\u2028\u2029]*(?:\r\n?|[\n\u2028\u2029])|[^\r\n\u2028\u2029]+'
+)
+_BYTE_LINE_RE = re.compile(b'[^\r\n]*(?:\r\n?|\n)|[^\r\n]+')
+_BYTE_LINE_BREAK_RE = re.compile(b'\r\n?|\n')
+
+
+def _complete_lines_end(text, final=False):
+    """
+    Find where the last complete line in `text` ends, which is after the last
+    line break that `_LINE_BREAK_RE` would match. Unless `final` is True, a
+    carriage return at the very end doesn't count yet, because the next piece
+    of input could start with the line feed that goes with it.
+    """
+    if text.endswith('\r') and not final:
+        text = text[:-1]
+    return max(text.rfind(char) for char in '\r\n\u2028\u2029') + 1
+
+
+class _LineDecoder:
+    """
+    Decodes a file that arrives in pieces, such as its lines or blocks of
+    bytes, into blocks of text made of complete lines. A piece can end in the
+    middle of a line, or in the middle of a character. Pieces that are already
+    text are just put together into lines.
+
+    If `encoding` is None, the encoding is guessed from the first line, using
+    `guess_bytes`, and that encoding is used for the rest of the input.
+
+    If the input can't be decoded, `decode` returns the lines that came before
+    the error, and sets `error` to the UnicodeDecodeError.
+    """
+
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+        self.error = None
+        self._decoder = None
+        self._head = b''
+        self._partial = ''
+        if encoding is not None:
+            self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def decode(self, data, final=False):
+        """
+        Decode the next piece of input, and return the text of the lines that
+        are now complete. When `final` is True, there's no more input, and
+        what's left over is returned as the last line.
+        """
+        if isinstance(data, str):
+            text = data
+        else:
+            text = self._decode_bytes(data, final)
+        if self._partial:
+            text = self._partial + text
+            self._partial = ''
+        if self.error is not None:
+            # Don't return part of the line with the error in it
+            return text[: _complete_lines_end(text, final=True)]
+        if final:
             return text
+        end = _complete_lines_end(text)
+        if end < len(text):
+            self._partial = text[end:]
+            text = text[:end]
+        return text
+
+    def _decode_bytes(self, data, final):
+        if self._decoder is None:
+            self._head += data
+            match = _BYTE_LINE_BREAK_RE.search(self._head)
+            if match is None and not final:
+                return ''
+            first_line = self._head[: match.end()] if match else self._head
+            self.encoding = guess_bytes(first_line)[1]
+            self._decoder = codecs.getincrementaldecoder(self.encoding)()
+            data, self._head = self._head, b''
+
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            pass
+
+        # Decode a line at a time until we find the error, so that we can
+        # return the lines before it.
+        pieces = []
+        byte_lines = _BYTE_LINE_RE.findall(data) or [data]
+        for i, byte_line in enumerate(byte_lines):
+            try:
+                pieces.append(
+                    self._decoder.decode(byte_line, final and i == len(byte_lines) - 1)
+                )
+            except UnicodeDecodeError as err:
+                self.error = err
+                break
+        return ''.join(pieces)
+
+
+def _decode_lines(lines, encoding):
+    """
+    Decode the lines of a file as they come, if they're bytes.
+    """
+    decoder = None
+    for line in lines:
+        if isinstance(line, bytes):
+            if decoder is None:
+                decoder = _LineDecoder(encoding)
+            yield from _LINE_RE.findall(decoder.decode(line))
+            if decoder.error is not None:
+                raise decoder.error
+        else:
+            yield line
+    if decoder is not None:
+        yield from _LINE_RE.findall(decoder.decode(b'', final=True))
+        if decoder.error is not None:
+            raise decoder.error
+
+
+@functools.lru_cache(maxsize=64)
+def _get_text_fixer(
+    fix_entities,
+    remove_terminal_escapes,
+    fix_encoding,
+    fix_latin_ligatures,
+    fix_character_width,
+    uncurl_quotes,
+    fix_line_breaks,
+    fix_surrogates,
+    remove_control_chars,
+    remove_bom,
+    normalization,
+    max_decode_length=10 ** 6,
+    segment_cache=None,
+    plan_cache=None,
+    propagate_plans=False,
+):
+    """
+    `fix_text` and its relatives make a TextFixer for each combination of
+    options they're called with, and keep the ones that were used recently.
+    The options are positional here because that makes the cache faster.
+    """
+    return TextFixer(
+        fix_entities=fix_entities,
+        remove_terminal_escapes=remove_terminal_escapes,
+        fix_encoding=fix_encoding,
+        fix_latin_ligatures=fix_latin_ligatures,
+        fix_character_width=fix_character_width,
+        uncurl_quotes=uncurl_quotes,
+        fix_line_breaks=fix_line_breaks,
+        fix_surrogates=fix_surrogates,
+        remove_control_chars=remove_control_chars,
+        remove_bom=remove_bom,
+        normalization=normalization,
+        max_decode_length=max_decode_length,
+        segment_cache=segment_cache,
+        plan_cache=plan_cache,
+        propagate_plans=propagate_plans,
+    )
+
+
+def fix_texts(texts, *, workers=None, chunksize=256, shared_tables=False, **options):
+    """
+    Fix many separate strings using a pool of worker processes, yielding the
+    fixed strings in the same order as the input.
+
+    `texts` can be any iterable of strings, including one that's too large to
+    fit in memory. It's read as results are needed, with a bounded number of
+    batches being worked on at a time. The strings are sent to the workers in
+    batches of `chunksize`, so that the overhead of communicating with the
+    workers stays small even for short strings.
+
+    `workers` is the number of processes to use, which defaults to the number
+    of CPUs. With `workers=1`, all the fixing happens in this process.
+
+    With `shared_tables=True`, ftfy's tables of characters and encodings are
+    built once, before the workers are started, instead of in each worker.
+    The workers are quicker to start, and share the memory that the tables
+    are in. This works when `multiprocessing` starts workers by forking them,
+    from this process or from its forkserver. Workers that are spawned start
+    the same way with or without it.
+
+    With the forkserver, this calls `multiprocessing.set_forkserver_preload`,
+    which applies to the whole process: it replaces the modules that were set
+    to be preloaded before, with `__main__` and `ftfy._shared_tables`. That
+    only has an effect if the forkserver hasn't started yet. If you preload
+    modules of your own, start the forkserver with them and with
+    `ftfy._shared_tables` before calling this.
+
+    The other keyword arguments are the options to `fix_text`, which is
+    applied to each string separately.
+
+        >>> list(fix_texts(['&lt;3', 'schÃ¶n'], workers=1))
+        ['<3', 'schön']
+    """
+    fixer = TextFixer(**options)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    batches = _batched(texts, chunksize)
+
+    if workers <= 1:
+        for batch in batches:
+            for text in batch:
+                yield fixer.fix_text(text)
+        return
+
+    with _make_worker_pool(workers, options, shared_tables) as pool:
+        for fixed_batch in _imap_bounded(pool, _fix_batch, batches, workers * 2):
+            yield from fixed_batch
+
+
+class DedupStats(collections.namedtuple('DedupStats', ['total', 'distinct'])):
+    """
+    Statistics from :func:`ftfy.fix_texts_deduplicated`: the `total` number
+    of strings, and how many `distinct` strings there were among them.
+    """
+    __slots__ = ()
+
+    @property
+    def ratio(self):
+        """
+        The number of strings per distinct string. A ratio of 10 means that
+        fixing the strings only took about a tenth of the work.
+        """
+        if self.distinct == 0:
+            return 1.0
+        return self.total / self.distinct
+
+
+def fix_texts_deduplicated(texts, *, workers=1, chunksize=256, **options):
+    """
+    Fix a batch of strings that repeat a lot, such as a column of city names,
+    by fixing each distinct string only once.
+
+    Returns a list of the fixed strings in the same order as the input, and a
+    `DedupStats` object that says how much repetition there was:
+
+        >>> column = ['SÃ£o Paulo', 'Paris', 'SÃ£o Paulo', 'SÃ£o Paulo']
+        >>> fixed, stats = fix_texts_deduplicated(column)
+        >>> fixed
+        ['São Paulo', 'Paris', 'São Paulo', 'São Paulo']
+        >>> stats
+        DedupStats(total=4, distinct=2)
+        >>> stats.ratio
+        2.0
+
+    The distinct strings are fixed with `fix_texts`, using `workers`
+    processes and batches of `chunksize`. By default, the work is done in
+    this process. The other keyword arguments are the options to `fix_text`.
+    """
+    index_of = {}
+    distinct = []
+    indices = []
+    for text in texts:
+        index = index_of.setdefault(text, len(distinct))
+        if index == len(distinct):
+            distinct.append(text)
+        indices.append(index)
+
+    fixed_distinct = list(
+        fix_texts(distinct, workers=workers, chunksize=chunksize, **options)
+    )
+    fixed = [fixed_distinct[index] for index in indices]
+    return fixed, DedupStats(len(indices), len(distinct))
+
+
+def _batched(iterable, size):
+    """
+    Group the items of an iterable into lists of length `size`, except that
+    the last list may be shorter.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _imap_bounded(pool, func, iterable, max_pending):
+    """
+    Like `pool.imap(func, iterable)`, except that only `max_pending` items
+    of the iterable are read ahead of the results that have been yielded.
+    (`Pool.imap` would read the whole iterable into its task queue.)
+    """
+    pending = collections.deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+# Each worker process in `fix_texts` keeps its own TextFixer here.
+_worker_fixer = None
+
+# Text that exercises every step of the pipeline, so that a worker builds all
+# the data it needs before it starts on real text.
+_WARMUP_TEXT = 'schÃ¶n &amp; \x1b[0mＬＯＵＤ\ufb01\u201cquote\u201d\r\n'
+
+
+def _make_worker_pool(workers, options, shared_tables=False):
+    """
+    Start a pool of `workers` processes that fix text with the given options,
+    for `fix_texts` or `fix_file`.
+
+    With `shared_tables`, the tables that ftfy uses are built before the
+    workers are forked, so that they inherit them, in memory that they share
+    until they write to it. Forked workers come from this process, or from
+    the forkserver, which builds the tables by preloading
+    `ftfy._shared_tables`. That only works if the forkserver hasn't started
+    yet; if it has, the workers build their own tables, as they would without
+    `shared_tables`, unless it was started with that module preloaded.
+    Spawned workers always build their own.
+    """
+    # multiprocessing takes a while to import, so only import it when needed
+    import multiprocessing
+
+    if shared_tables:
+        method = multiprocessing.get_start_method()
+        if method == 'fork':
+            TextFixer(**options).fix_text(_WARMUP_TEXT)
+        elif method == 'forkserver':
+            # There's one forkserver for the whole process, so this setting
+            # is global. It's read when the forkserver starts, which is when
+            # this pool starts its workers, if it isn't running already.
+            multiprocessing.get_context('forkserver').set_forkserver_preload(
+                ['__main__', 'ftfy._shared_tables']
+            )
+    return multiprocessing.Pool(workers, _init_worker, (options,))
+
+
+def _init_worker(options):
+    """
+    Set up a worker process for `fix_texts`, or for `fix_file` with more than
+    one worker.
+    """
+    global _worker_fixer
+    _worker_fixer = TextFixer(**options)
+    _worker_fixer.fix_text(_WARMUP_TEXT)
+
+
+def _fix_batch(texts):
+    """
+    Fix a batch of strings in a worker process for `fix_texts`.
+    """
+    return [_worker_fixer.fix_text(text) for text in texts]
+
+
+def _fix_file_block(text, state):
+    """
+    Fix a block of lines from a file in a worker process, starting in the
+    given state, and return the fixed text and the state for the text after
+    it. See `TextFixer._fix_lines_of_text`.
+    """
+    return _worker_fixer._fix_lines_of_text(text, state, None)
+
+
+def _fix_file_in_parallel(input_file, encoding, buffer_size, workers, options):
+    """
+    Read a file in blocks of `buffer_size`, fix the lines in each block using
+    `workers` worker processes, and yield the fixed lines in order, for
+    `fix_file`.
+
+    Only a few blocks are read ahead of the ones that have been yielded, so
+    memory use doesn't depend on the size of the file.
+
+    A block's result depends on the blocks before it: whether any of them
+    looked like HTML, when `fix_entities='auto'`, and the last plan that fixed
+    the encoding of a line, when `propagate_plans` is on. We send off each
+    block assuming the state that the blocks before it were last known to
+    leave. If that turns out to be wrong, the block is fixed again in the
+    right state. In a file that's consistent, the state soon stops changing,
+    and the assumptions are right.
+    """
+    decoder = _LineDecoder(encoding)
+    state = TextFixer(**options)._initial_state
+    read = getattr(input_file, 'read1', input_file.read)
+    pending = collections.deque()
+
+    with _make_worker_pool(workers, options) as pool:
+
+        def next_result():
+            nonlocal state
+            text, assumed, result = pending.popleft()
+            fixed, after = result.get()
+            if assumed != state:
+                fixed, after = pool.apply(_fix_file_block, (text, state))
+            state = after
+            return _LINE_RE.findall(fixed)
+
+        final = False
+        while not final:
+            chunk = read(buffer_size)
+            final = not chunk
+            text = decoder.decode(chunk, final)
+            if text:
+                assumed = state
+                result = pool.apply_async(_fix_file_block, (text, assumed))
+                pending.append((text, assumed, result))
+            if decoder.error is not None:
+                break
+            if len(pending) >= workers * 2:
+                yield from next_result()
+
+        while pending:
+            yield from next_result()
+
+    if decoder.error is not None:
+        raise decoder.error
 
 
 def guess_bytes(bstring):
@@ -405,6 +1681,9 @@ def explain_unicode(text):
         U+2501  ━       [So] BOX DRAWINGS HEAVY HORIZONTAL
         U+253B  ┻       [So] BOX DRAWINGS HEAVY UP AND HORIZONTAL
     """
+    # This is the only thing in ftfy that needs wcwidth, so we import it here
+    from ftfy.formatting import display_ljust
+
     for char in text:
         if char.isprintable():
             display = char
@@ -0,0 +1,11 @@
+"""
+Build the tables that ftfy uses, as soon as this module is imported.
+
+`ftfy.fix_texts` asks the forkserver of `multiprocessing`, when it starts
+workers that way, to import this module before it forks any of them. The
+workers then share the memory that the tables are in, the same way that
+workers forked from the main process do.
+"""
+from ftfy import chardata
+
+chardata.build_tables()
@@ -0,0 +1,162 @@
+"""
+Versions of `fix_text` and `fix_file` for programs that use asyncio.
+
+Fixing a large amount of text takes long enough to hold up an event loop. The
+functions in this module fix text in slices of whole lines, running each slice
+in an executor, and give other tasks a chance to run between the slices:
+
+    >>> import asyncio
+    >>> print(asyncio.run(fix_text('L&eacute;on d&rsquo;Arc\\n')))
+    Léon d'Arc
+    <BLANKLINE>
+
+The `executor` can be any `concurrent.futures` executor. By default, it's the
+event loop's default executor, which runs in threads. To get work off the
+main process entirely, you can use a `ProcessPoolExecutor`.
+
+These functions take the same options as their counterparts in the `ftfy`
+module, and they get the same results.
+
+This module requires Python 3.7 or later.
+"""
+import asyncio
+import functools
+
+from ftfy import _LINE_BREAK_RE, _LINE_RE, TextFixer, _LineDecoder, fixes
+
+
+@functools.lru_cache(maxsize=64)
+def _get_fixer(options):
+    """
+    Get a TextFixer for a tuple of option items. Executors get the options
+    instead of the TextFixer, because a TextFixer can't be sent to another
+    process.
+    """
+    return TextFixer(**dict(options))
+
+
+def _fix_text_slice(options, text, state):
+    "Fix a slice of text that `fix_text` was given, in an executor."
+    fixer = _get_fixer(options)
+    return fixer._fix_lines_of_text(text, state, fixer.max_decode_length)
+
+
+def _fix_file_block(options, text, state):
+    "Fix a block of lines that `fix_file` read, in an executor."
+    return _get_fixer(options)._fix_lines_of_text(text, state, None)
+
+
+def _slices(text, size):
+    """
+    Split text into slices of about `size` characters, ending at line breaks.
+    A line longer than `size` gets a slice to itself.
+    """
+    pos = 0
+    while pos < len(text):
+        # Start looking a character early, so that a '\r\n' that straddles
+        # the position is found as one line break
+        match = _LINE_BREAK_RE.search(text, pos + size - 1)
+        end = match.end() if match else len(text)
+        yield text[pos:end]
+        pos = end
+
+
+async def fix_text(text, *, executor=None, slice_size=2 ** 16, **options):
+    """
+    Fix text without blocking the event loop. This gets the same result as
+    :func:`ftfy.fix_text` with the same options.
+
+    The text is fixed in slices of about `slice_size` characters, which end at
+    line breaks, and each slice is run in the `executor`.
+    """
+    if isinstance(text, bytes):
+        raise UnicodeError(fixes.BYTES_ERROR_TEXT)
+
+    loop = asyncio.get_running_loop()
+    options = tuple(sorted(options.items()))
+    state = _get_fixer(options)._initial_state
+    out = []
+    changed = False
+    for text_slice in _slices(text, slice_size):
+        fixed, state = await loop.run_in_executor(
+            executor, _fix_text_slice, options, text_slice, state
+        )
+        changed = changed or fixed != text_slice
+        out.append(fixed)
+        await asyncio.sleep(0)
+    if not changed:
+        return text
+    return ''.join(out)
+
+
+async def fix_file(
+    input_file,
+    encoding=None,
+    *,
+    executor=None,
+    buffer_size=2 ** 16,
+    block_size=2 ** 16,
+    **options
+):
+    """
+    Fix text that is found in an asynchronous stream, yielding fixed lines.
+    This gets the same result as :func:`ftfy.fix_file` with the same options.
+
+    `input_file` can be an object with an asynchronous `read` method, such as
+    an `asyncio.StreamReader`, which will be read `buffer_size` bytes at a
+    time. Otherwise, it should be an asynchronous iterator of chunks. Either
+    way, it can produce bytes or text. Bytes are decoded incrementally using
+    `encoding`, or an encoding that's guessed from the first line, in the same
+    way that `ftfy.fix_file` does.
+
+    Lines are fixed in blocks of about `block_size` characters, and each block
+    is run in the `executor`.
+    """
+    loop = asyncio.get_running_loop()
+    options = tuple(sorted(options.items()))
+    state = _get_fixer(options)._initial_state
+    decoder = _LineDecoder(encoding)
+    pending = []
+    pending_size = 0
+
+    async def fix_pending():
+        nonlocal state
+        fixed, state = await loop.run_in_executor(
+            executor, _fix_file_block, options, ''.join(pending), state
+        )
+        return _LINE_RE.findall(fixed)
+
+    async for chunk in _read_chunks(input_file, buffer_size):
+        text = decoder.decode(chunk)
+        pending.append(text)
+        pending_size += len(text)
+        if pending_size >= block_size or decoder.error is not None:
+            for line in await fix_pending():
+                yield line
+            if decoder.error is not None:
+                raise decoder.error
+            pending = []
+            pending_size = 0
+            await asyncio.sleep(0)
+
+    pending.append(decoder.decode(b'', final=True))
+    for line in await fix_pending():
+        yield line
+    if decoder.error is not None:
+        raise decoder.error
+
+
+async def _read_chunks(input_file, buffer_size):
+    """
+    Iterate over the chunks of an asynchronous stream, whether it has a
+    `read` method or is an asynchronous iterator.
+    """
+    if hasattr(input_file, 'read'):
+        while True:
+            chunk = await input_file.read(buffer_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        async for chunk in input_file:
+            yield chunk
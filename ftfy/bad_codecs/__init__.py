@@ -11,7 +11,8 @@ There are some encodings out there that Python wishes didn't exist, which are
 widely used outside of Python:
 
 - "utf-8-variants", a family of not-quite-UTF-8 encodings, including the
-  ever-popular CESU-8 and "Java modified UTF-8".
+  ever-popular CESU-8 and "Java modified UTF-8". You can also encode text in
+  those two, as "cesu-8" and "java-utf-8".
 - "Sloppy" versions of character map encodings, where bytes that don't map to
   anything will instead map to the Unicode character with the same number.
 
@@ -39,10 +40,13 @@ UTF8_VAR_NAMES = (
     'utf_8_variants', 'utf8_variants',
     'utf_8_variant', 'utf8_variant',
     'utf_8_var', 'utf8_var',
-    'cesu_8', 'cesu8',
-    'java_utf_8', 'java_utf8'
 )
 
+# These names decode the same way as 'utf-8-variants', but they encode in the
+# variant they're named after, instead of in standard UTF-8.
+CESU8_NAMES = ('cesu_8', 'cesu8')
+JAVA_UTF8_NAMES = ('java_utf_8', 'java_utf8')
+
 
 def search_function(encoding):
     """
@@ -57,6 +61,8 @@ def search_function(encoding):
       unmapped to characters.
     - The 'utf-8-variants' encoding, which has the several aliases seen
       above.
+    - The 'cesu-8' and 'java-utf-8' encodings, which decode like
+      'utf-8-variants' but encode in those variants.
     """
     if encoding in _CACHE:
         return _CACHE[encoding]
@@ -66,6 +72,12 @@ def search_function(encoding):
     if norm_encoding in UTF8_VAR_NAMES:
         from ftfy.bad_codecs.utf8_variants import CODEC_INFO
         codec = CODEC_INFO
+    elif norm_encoding in CESU8_NAMES:
+        from ftfy.bad_codecs.utf8_variants import CESU8_CODEC_INFO
+        codec = CESU8_CODEC_INFO
+    elif norm_encoding in JAVA_UTF8_NAMES:
+        from ftfy.bad_codecs.utf8_variants import JAVA_CODEC_INFO
+        codec = JAVA_CODEC_INFO
     elif norm_encoding.startswith('sloppy_'):
         from ftfy.bad_codecs.sloppy import CODECS
         codec = CODECS.get(norm_encoding)
@@ -29,9 +29,16 @@ in Java.
 
 If you encode with this codec, you get legitimate UTF-8. Decoding with this
 codec and then re-encoding is not idempotent, although encoding and then
-decoding is. So this module won't produce CESU-8 for you. Look for that
-functionality in the sister module, "Breaks Text For You", coming approximately
-never.
+decoding is.
+
+When a program on the other end really wants one of these variants, such as
+a Java program that reads modified UTF-8, encode with "cesu-8" instead, which
+encodes characters outside the BMP as surrogate pairs, or with "java-utf-8",
+which also encodes `U+0000` as `0xc0 0x80`. These decode the same way as
+"utf-8-variants".
+
+    >>> 'null: \x00, emoji: 😍'.encode('java-utf-8')
+    b'null: \xc0\x80, emoji: \xed\xa0\xbd\xed\xb8\x8d'
 
 .. [1] In a pinch, you can decode CESU-8 in Python 2 using the UTF-8 codec:
    first decode the bytes (incorrectly), then encode them, then decode them
@@ -40,6 +47,7 @@ never.
 
 import re
 import codecs
+import functools
 from encodings.utf_8 import (IncrementalDecoder as UTF8IncrementalDecoder,
                              IncrementalEncoder as UTF8IncrementalEncoder)
 
@@ -102,13 +110,16 @@ class IncrementalDecoder(UTF8IncrementalDecoder):
         # decoded_segments are the pieces of text we have decoded so far,
         # and position is our current position in the byte string. (Bytes
         # before this position have been consumed, and bytes after it have
-        # yet to be decoded.)
+        # yet to be decoded.) We look at the bytes through a memoryview, so
+        # that taking a slice of them doesn't copy the rest of the input.
+        view = memoryview(input)
         decoded_segments = []
         position = 0
         while True:
             # Use _buffer_decode_step to decode a segment of text.
             decoded, consumed = self._buffer_decode_step(
-                input[position:],
+                view,
+                position,
                 errors,
                 final
             )
@@ -128,7 +139,7 @@ class IncrementalDecoder(UTF8IncrementalDecoder):
 
         return ''.join(decoded_segments), position
 
-    def _buffer_decode_step(self, input, errors, final):
+    def _buffer_decode_step(self, input, position, errors, final):
         """
         There are three possibilities for each decoding step:
 
@@ -136,38 +147,43 @@ class IncrementalDecoder(UTF8IncrementalDecoder):
         - Decode a six-byte CESU-8 sequence at the current position.
         - Decode a Java-style null at the current position.
 
-        This method figures out which step is appropriate, and does it.
+        This method figures out which step is appropriate, and does it,
+        starting at `position` in the input. It searches the input from
+        there instead of slicing it, so decoding the whole input takes one
+        pass over it, however many special sequences it has.
         """
         # Get a reference to the superclass method that we'll be using for
         # most of the real work.
         sup = UTF8IncrementalDecoder._buffer_decode
 
         # Find the next byte position that indicates a variant of UTF-8.
-        match = SPECIAL_BYTES_RE.search(input)
+        match = SPECIAL_BYTES_RE.search(input, position)
         if match is None:
-            return sup(input, errors, final)
+            return sup(input[position:], errors, final)
 
         cutoff = match.start()
-        if cutoff > 0:
-            return sup(input[:cutoff], errors, True)
+        if cutoff > position:
+            return sup(input[position:cutoff], errors, True)
 
         # Some byte sequence that we intend to handle specially matches
-        # at the beginning of the input.
-        if input.startswith(b'\xc0'):
-            if len(input) > 1:
+        # at the current position.
+        if input[position] == 0xc0:
+            if len(input) > position + 1:
                 # Decode the two-byte sequence 0xc0 0x80.
                 return '\u0000', 2
             else:
                 if final:
                     # We hit the end of the stream. Let the superclass method
                     # handle it.
-                    return sup(input, errors, True)
+                    return sup(input[position:], errors, True)
                 else:
                     # Wait to see another byte.
                     return '', 0
         else:
             # Decode a possible six-byte sequence starting with 0xed.
-            return self._buffer_decode_surrogates(sup, input, errors, final)
+            return self._buffer_decode_surrogates(
+                sup, input[position:position + 6], errors, final
+            )
 
     @staticmethod
     def _buffer_decode_surrogates(sup, input, errors, final):
@@ -215,9 +231,95 @@ class IncrementalDecoder(UTF8IncrementalDecoder):
                 return sup(input[:3], errors, False)
 
 
-# The encoder is identical to UTF-8.
+# The encoder for 'utf-8-variants' is identical to UTF-8.
 IncrementalEncoder = UTF8IncrementalEncoder
 
+# These expressions match the characters that CESU-8 encodes differently from
+# UTF-8, which are the characters outside the BMP, and for Java's modified
+# UTF-8, U+0000 as well.
+ASTRAL_RE = re.compile('[\U00010000-\U0010ffff]')
+JAVA_SPECIAL_RE = re.compile('[\x00\U00010000-\U0010ffff]')
+
+# UTF-8 encodes characters outside the BMP, and only those, with sequences
+# that start with these bytes.
+ASTRAL_LEAD_BYTES = (b'\xf0', b'\xf1', b'\xf2', b'\xf3', b'\xf4')
+
+# The error handlers built into Python, none of which can put a null byte in
+# the output, so the null bytes after encoding are all from U+0000
+BUILTIN_ERROR_HANDLERS = frozenset([
+    'strict', 'ignore', 'replace', 'backslashreplace', 'namereplace',
+    'xmlcharrefreplace', 'surrogateescape', 'surrogatepass',
+])
+
+
+@functools.lru_cache(maxsize=4096)
+def _special_sequence(char):
+    """
+    Encode a character that CESU-8 or Java's modified UTF-8 encodes
+    differently from UTF-8: a character outside the BMP, as the UTF-8 form of
+    its two UTF-16 surrogates, or U+0000, as 0xc0 0x80. Text that has these
+    characters tends to use the same few of them, such as emoji, many times.
+    """
+    if char == '\x00':
+        return b'\xc0\x80'
+    codepoint = ord(char) - 0x10000
+    pair = chr(0xd800 + (codepoint >> 10)) + chr(0xdc00 + (codepoint & 0x3ff))
+    return pair.encode('utf-8', 'surrogatepass')
+
+
+def _encode_variant(input, errors, java):
+    """
+    Encode text as CESU-8, or as Java's modified UTF-8 if `java` is true,
+    which also encodes U+0000 as 0xc0 0x80.
+
+    Most text encodes the same way as in UTF-8, so we let the real UTF-8
+    encoder do the work, including handling errors. If there turn out to be
+    any characters that need to be encoded differently, we encode the text
+    again in pieces, leaving those characters out of what the UTF-8 encoder
+    and its error handler see. Checking for them takes a few fast searches of
+    the bytes, so text that only has characters in the BMP is encoded almost
+    as quickly as in UTF-8.
+    """
+    encoded = codecs.utf_8_encode(input, errors)[0]
+    if not any(lead in encoded for lead in ASTRAL_LEAD_BYTES):
+        if java and b'\x00' in encoded:
+            if errors in BUILTIN_ERROR_HANDLERS:
+                return encoded.replace(b'\x00', b'\xc0\x80')
+            return b'\xc0\x80'.join(
+                codecs.utf_8_encode(piece, errors)[0] for piece in input.split('\x00')
+            )
+        return encoded
+
+    # The lead bytes might have come from the error handler, in which case
+    # this gets the same result the slow way
+    special_re = JAVA_SPECIAL_RE if java else ASTRAL_RE
+    pieces = []
+    position = 0
+    for match in special_re.finditer(input):
+        pieces.append(codecs.utf_8_encode(input[position:match.start()], errors)[0])
+        pieces.append(_special_sequence(match.group()))
+        position = match.end()
+    pieces.append(codecs.utf_8_encode(input[position:], errors)[0])
+    return b''.join(pieces)
+
+
+class CESU8IncrementalEncoder(codecs.IncrementalEncoder):
+    """
+    An incremental encoder for CESU-8. Every character is encoded on its own,
+    so it doesn't need to keep any state between calls.
+    """
+    java = False
+
+    def encode(self, input, final=False):
+        return _encode_variant(input, self.errors, self.java)
+
+
+class JavaIncrementalEncoder(CESU8IncrementalEncoder):
+    """
+    An incremental encoder for Java's modified UTF-8.
+    """
+    java = True
+
 
 # Everything below here is boilerplate that matches the modules in the
 # built-in `encodings` package.
@@ -225,16 +327,32 @@ def encode(input, errors='strict'):
     return IncrementalEncoder(errors).encode(input, final=True), len(input)
 
 
+def encode_cesu8(input, errors='strict'):
+    return _encode_variant(input, errors, False), len(input)
+
+
+def encode_java(input, errors='strict'):
+    return _encode_variant(input, errors, True), len(input)
+
+
 def decode(input, errors='strict'):
     return IncrementalDecoder(errors).decode(input, final=True), len(input)
 
 
 class StreamWriter(codecs.StreamWriter):
-    encode = encode
+    encode = staticmethod(encode)
+
+
+class CESU8StreamWriter(codecs.StreamWriter):
+    encode = staticmethod(encode_cesu8)
+
+
+class JavaStreamWriter(codecs.StreamWriter):
+    encode = staticmethod(encode_java)
 
 
 class StreamReader(codecs.StreamReader):
-    decode = decode
+    decode = staticmethod(decode)
 
 
 CODEC_INFO = codecs.CodecInfo(
@@ -246,3 +364,23 @@ CODEC_INFO = codecs.CodecInfo(
     streamreader=StreamReader,
     streamwriter=StreamWriter,
 )
+
+CESU8_CODEC_INFO = codecs.CodecInfo(
+    name='cesu-8',
+    encode=encode_cesu8,
+    decode=decode,
+    incrementalencoder=CESU8IncrementalEncoder,
+    incrementaldecoder=IncrementalDecoder,
+    streamreader=StreamReader,
+    streamwriter=CESU8StreamWriter,
+)
+
+JAVA_CODEC_INFO = codecs.CodecInfo(
+    name='java-utf-8',
+    encode=encode_java,
+    decode=decode,
+    incrementalencoder=JavaIncrementalEncoder,
+    incrementaldecoder=IncrementalDecoder,
+    streamreader=StreamReader,
+    streamwriter=JavaStreamWriter,
+)
@@ -1,12 +1,17 @@
 """
 Heuristics to determine whether re-encoding text is actually making it
 more reasonable.
+
+The regexes that depend on the character classes in
+:mod:`ftfy.chardata` are built the first time they're needed.
 """
 
+import functools
 import re
+import sys
 import unicodedata
 
-from ftfy.chardata import chars_to_classes
+from ftfy.chardata import char_class_regex, chars_to_classes, is_ascii
 
 # The following regex uses the mapping of character classes to ASCII
 # characters defined in chardata.py and build_data.py:
@@ -29,6 +34,7 @@ from ftfy.chardata import chars_to_classes
 # o = Other
 
 
+@functools.lru_cache(maxsize=None)
 def _make_weirdness_regex():
     """
     Creates a list of regexes that match 'weird' character sequences.
@@ -93,7 +99,64 @@ def _make_weirdness_regex():
     return re.compile(regex)
 
 
-WEIRDNESS_RE = _make_weirdness_regex()
+@functools.lru_cache(maxsize=None)
+def _make_pairwise_weirdness_regex():
+    """
+    Make a regex that finds the same matches as WEIRDNESS_RE, but faster.
+
+    Every alternative in WEIRDNESS_RE matches one or two characters, so what
+    it matches at a position depends only on the character class there and
+    the one after it. We find out what it matches for every pair of classes,
+    and make a regex with one alternative for each group of classes that the
+    match can start with. Only one of these alternatives can apply at any
+    position, so the regex engine doesn't have to try them all.
+    """
+    weirdness_re = _make_weirdness_regex()
+
+    def match_length(string):
+        match = weirdness_re.match(string)
+        return match.end() if match else 0
+
+    from ftfy.char_classes import PAGES
+
+    classes = sorted(set(PAGES))
+    starts = {}
+    for cls in classes:
+        # The classes that make a two-character match after this one
+        pairs = ''.join(
+            next_cls
+            for next_cls in classes
+            if match_length(cls + next_cls) == 2
+        )
+        # Whether this class matches on its own, when it's not part of a pair
+        single = match_length(cls) == 1
+        starts.setdefault((pairs, single), []).append(cls)
+
+    alternatives = []
+    for (pairs, single), start_classes in starts.items():
+        if not (pairs or single):
+            continue
+        alternative = char_class_regex(start_classes).pattern
+        if pairs:
+            alternative += char_class_regex(pairs).pattern
+            if single:
+                alternative += '?'
+        alternatives.append(alternative)
+    return re.compile('|'.join(alternatives))
+
+
+@functools.lru_cache(maxsize=None)
+def _make_ascii_weirdness_regex():
+    """
+    Make a regex that finds what WEIRDNESS_RE finds in ASCII text, where the
+    only weird thing is a control character on its own.
+    """
+    weirdness_re = _make_weirdness_regex()
+    return char_class_regex(
+        chr(codept)
+        for codept in range(0x80)
+        if weirdness_re.match(chars_to_classes(chr(codept)))
+    )
 
 # These characters appear in mojibake but also appear commonly on their own.
 # We have a slight preference to leave them alone.
@@ -206,6 +269,10 @@ MOJIBAKE_SYMBOL_RE = re.compile(
     'вЂ[љћ¦°№™ќ“”]'
 )
 
+# Every match of MOJIBAKE_SYMBOL_RE contains one of these characters, so text
+# without them doesn't need to be searched with it.
+_MOJIBAKE_SYMBOL_CHARS_RE = re.compile('[ÂÃÎÏÐÑØÙĂĎĐŃŘŮ×¬√◊ðđâв]')
+
 
 def sequence_weirdness(text):
     """
@@ -234,11 +301,16 @@ def sequence_weirdness(text):
 
     The return value is the number of instances of weirdness.
     """
+    if is_ascii(text):
+        # ASCII text is already normalized, and none of the other patterns
+        # can match it
+        return len(_make_ascii_weirdness_regex().findall(text)) * 2
+
     text2 = unicodedata.normalize('NFC', text)
-    weirdness = len(WEIRDNESS_RE.findall(chars_to_classes(text2)))
-    adjustment = len(MOJIBAKE_SYMBOL_RE.findall(text2)) * 2 - len(
-        COMMON_SYMBOL_RE.findall(text2)
-    )
+    weirdness = len(_make_pairwise_weirdness_regex().findall(chars_to_classes(text2)))
+    adjustment = -len(COMMON_SYMBOL_RE.findall(text2))
+    if _MOJIBAKE_SYMBOL_CHARS_RE.search(text2):
+        adjustment += len(MOJIBAKE_SYMBOL_RE.findall(text2)) * 2
     return weirdness * 2 + adjustment
 
 
@@ -251,3 +323,70 @@ def text_cost(text):
     :func:`sequence_weirdness`) plus the length.
     """
     return sequence_weirdness(text) + len(text)
+
+
+# A run of at least 4 ASCII characters. Text can be split in the middle of
+# such a run, leaving at least two ASCII characters on each side, without
+# changing its cost: NFC normalization never combines or reorders ASCII
+# characters with their neighbors, and no weird sequence that we look for
+# contains two ASCII characters in a row.
+_ASCII_RUN_RE = re.compile('[\x00-\x7f]{4,}')
+
+# Text shorter than this isn't worth splitting
+SEGMENTED_COST_MIN_LENGTH = 1000
+
+
+def segmented_text_cost(text, cache):
+    """
+    Get the same result as :func:`text_cost`, by splitting long text into
+    segments and adding up their costs.
+
+    The segments that contain non-ASCII characters have their costs stored
+    in the dictionary `cache`, so that when we compute the cost of a similar
+    string, such as a slightly different way of decoding the same text, we
+    only need to look at the parts that changed. The segments in between are
+    all ASCII, so their costs are quick to compute.
+    """
+    if len(text) < SEGMENTED_COST_MIN_LENGTH:
+        return text_cost(text)
+
+    ascii_weirdness_re = _make_ascii_weirdness_regex()
+    has_controls = ascii_weirdness_re.search(text) is not None
+    total = 0
+    start = 0
+    for match in _ASCII_RUN_RE.finditer(text):
+        ascii_start = match.start() + 2
+        ascii_end = match.end() - 2
+        if ascii_start > start:
+            total += _cached_text_cost(text[start:ascii_start], cache)
+        total += ascii_end - ascii_start
+        if has_controls:
+            total += len(ascii_weirdness_re.findall(text, ascii_start, ascii_end)) * 2
+        start = ascii_end
+    if start < len(text):
+        total += _cached_text_cost(text[start:], cache)
+    return total
+
+
+def _cached_text_cost(text, cache):
+    cost = cache.get(text)
+    if cost is None:
+        cost = cache[text] = text_cost(text)
+    return cost
+
+
+def __getattr__(name):
+    """
+    Build WEIRDNESS_RE when it's first looked up as an attribute of this
+    module. (See PEP 562.)
+    """
+    if name != 'WEIRDNESS_RE':
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        )
+    return _make_weirdness_regex()
+
+
+if sys.version_info < (3, 7):
+    # Modules can't have a __getattr__ before Python 3.7
+    WEIRDNESS_RE = _make_weirdness_regex()
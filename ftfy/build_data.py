@@ -37,7 +37,7 @@ import zlib
 
 def make_char_data_file(do_it_anyway=False):
     """
-    Build the compressed data file 'char_classes.dat' and write it to the
+    Build the compressed data file 'char_classes.py' and write it to the
     current directory.
 
     If you run this, run it in Python 3.8 or later. It will run in earlier
@@ -120,17 +120,43 @@ def make_char_data_file(do_it_anyway=False):
     for char in "^~`´˝＾｀":
         cclasses[ord(char)] = 'o'
 
-    # Compress and encode this string within a Python script.
-    char_classes_bytes = ''.join(cclasses).encode('ascii')
-    encoded = base64.b64encode(zlib.compress(char_classes_bytes))
+    write_char_classes_file(''.join(cclasses))
+
+
+def write_char_classes_file(char_class_string):
+    """
+    Write 'char_classes.py', which stores the class of every codepoint, given
+    as a string of one class letter per codepoint.
+
+    The string is split into pages of 256 codepoints. Most pages are the same
+    as some other page, such as the many pages of unassigned characters, so
+    we store each distinct page once, in PAGES, and PAGE_INDEX gives the
+    number of the distinct page that each page is the same as.
+    """
+    pages = {}
+    page_index = bytearray()
+    for start in range(0, len(char_class_string), 256):
+        page = char_class_string[start:start + 256]
+        page_index.append(pages.setdefault(page, len(pages)))
+    if len(pages) > 256:
+        raise ValueError("There are too many distinct pages to index with bytes")
+
+    # Compress and encode this data within a Python script.
+    encoded_index = base64.b64encode(zlib.compress(bytes(page_index)))
+    encoded_pages = base64.b64encode(zlib.compress(''.join(pages).encode('ascii')))
 
     script = """
 # This script is automatically generated by build_data.py.
+#
+# The character class of codepoint `c` is the letter at index
+# `PAGE_INDEX[c >> 8] * 256 + (c & 0xff)` of PAGES.
 import base64
 import zlib
-_compressed = {encoded!r}
-CHAR_CLASS_STRING = zlib.decompress(base64.b64decode(_compressed)).decode('ascii')
-""".format(encoded=encoded)
+_compressed_index = {encoded_index!r}
+_compressed_pages = {encoded_pages!r}
+PAGE_INDEX = zlib.decompress(base64.b64decode(_compressed_index))
+PAGES = zlib.decompress(base64.b64decode(_compressed_pages)).decode('ascii')
+""".format(encoded_index=encoded_index, encoded_pages=encoded_pages)
     with open('char_classes.py', 'w', encoding='utf-8') as out:
         print(script, file=out)
 
@@ -0,0 +1,193 @@
+"""
+Bounded caches that can make ftfy faster on text that repeats a lot.
+
+None of these caches are used unless you ask for them. See the
+`segment_cache` and `plan_cache` options of :func:`ftfy.fix_text`.
+"""
+import collections
+import threading
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'entries', 'size']
+)
+
+
+class LRUCache:
+    """
+    A thread-safe cache that forgets the least recently used entries when it
+    gets too big.
+
+    It's bounded in two ways: by the number of entries, `max_entries`, and by
+    the total size of the entries, `max_size`, where the size of each entry is
+    given when it's stored. Either bound can be None, to leave it unbounded.
+
+        >>> cache = LRUCache(max_entries=2)
+        >>> cache.put('a', 1)
+        >>> cache.put('b', 2)
+        >>> cache.get('a')
+        1
+        >>> cache.put('c', 3)
+        >>> print(cache.get('b'))
+        None
+        >>> cache.info()
+        CacheInfo(hits=1, misses=1, evictions=1, entries=2, size=2)
+    """
+
+    def __init__(self, max_entries=10000, max_size=None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Look up `key`, returning `default` if it's not in the cache.
+        """
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size=1):
+        """
+        Store `value` under `key`, with the given size, and then forget old
+        entries until the cache is within its bounds again.
+        """
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_size is not None and self._size > self.max_size)
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Forget all the entries, and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """
+        Get statistics about how the cache has been used, as a CacheInfo
+        tuple of `hits`, `misses`, `evictions`, the current number of
+        `entries`, and their total `size`.
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self._size
+            )
+
+    def __len__(self):
+        return len(self._entries)
+
+    # A pickled cache comes back empty, with the same bounds. This lets a
+    # cache be passed as an option to worker processes, such as the ones
+    # that `ftfy.fix_texts` starts, and each of them gets a cache of its own.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_entries', '_lock', '_size', 'hits', 'misses', 'evictions'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+class SegmentCache(LRUCache):
+    """
+    A cache of segments of text that have been fixed, for use with the
+    `segment_cache` option of :func:`ftfy.fix_text` and related functions.
+    It's useful when the same lines come up again and again, such as in log
+    files or CSV fields.
+
+    The entries are keyed on the text and the options it was fixed with, so
+    one SegmentCache can be shared by calls with different options. The size
+    of each entry is the number of characters in the original and fixed text,
+    and `max_chars` bounds the total.
+
+    Segments longer than `max_length` characters skip the cache entirely. Long
+    lines are unlikely to repeat, and caching them would take up a lot of
+    memory.
+
+        >>> import ftfy
+        >>> cache = SegmentCache()
+        >>> for _ in range(3):
+        ...     print(ftfy.fix_text('Ã©tÃ©\\n', segment_cache=cache), end='')
+        été
+        été
+        été
+        >>> cache.info()
+        CacheInfo(hits=2, misses=1, evictions=0, entries=1, size=10)
+    """
+
+    def __init__(self, max_entries=10000, max_chars=10 ** 6, max_length=1000):
+        super().__init__(max_entries=max_entries, max_size=max_chars)
+        self.max_length = max_length
+
+
+class PlanCache(LRUCache):
+    """
+    A cache of the plans that fixed the encoding of text, for use with the
+    `plan_cache` option of :func:`ftfy.fix_text` and
+    :func:`ftfy.fixes.fix_encoding`. It's useful when many strings have been
+    broken in the same way, such as the rows of a table that was all decoded
+    with the wrong encoding.
+
+    Plans are keyed on a signature of the text they fixed: the set of
+    non-ASCII characters in it, and the encodings it could be in. Only plans
+    that changed something are stored. A plan that's looked up is checked
+    before it's used, and `rejected` counts the plans that failed the check.
+
+        >>> from ftfy.fixes import fix_encoding
+        >>> cache = PlanCache()
+        >>> for text in ['cafÃ©', 'Ã©tÃ©', 'cafÃ© crÃ©me']:
+        ...     print(fix_encoding(text, plan_cache=cache))
+        café
+        été
+        café créme
+        >>> cache.info()
+        CacheInfo(hits=2, misses=1, evictions=0, entries=1, size=1)
+    """
+
+    def __init__(self, max_entries=10000):
+        super().__init__(max_entries=max_entries)
+        self.rejected = 0
+
+    def clear(self):
+        """
+        Forget all the entries, and reset the statistics.
+        """
+        super().clear()
+        self.rejected = 0
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state['rejected']
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.rejected = 0
@@ -1,7 +1,12 @@
 
 # This script is automatically generated by build_data.py.
+#
+# The character class of codepoint `c` is the letter at index
+# `PAGE_INDEX[c >> 8] * 256 + (c & 0xff)` of PAGES.
 import base64
 import zlib
-_compressed = b'eJzt3Uluq8oCANCt3C1gVhB5GqIn/cmboQy/FMT+Z4+eom/s2E7uOc5NjCmqp8DYl/r338afP+XPxJ88z6O80vzpRVHx0vuiOtDXojLCaYKT9ItUoji/xNcifHyJo4+P/DPPLx/X/KN4upB21PxdSjtqn7yffGy/sPFotmqelD9lHO/v/cLXexfsvU2hXlU9+fp678rQ/WzmqY3nbLnf+1TrXLw3mW4e/2/1z54n3w6SPNjb59tndnn7TNPs8/Mzf0sLl8tb/vb2lhaPYvVY2j373FaEqQO+LTzqQFGZzuc0rW078jDK0NYjDmrmxGNUvJOx7H6kmzVUN1qa1cPf7orK8zSN4yg91Jvy4lH/pI3rsnZ1mVInGMmLnzgOI8+LtSvxVbL+6XwOB4pAWxHeQd5mJW+Kk2VJUj0tC9/n5RrH12H+0nwrgyuNsVr5twlSuaYDg/LsjCTL4iJ8lqZJFC0Hzfrw3VKYXl1ha6kVocP16Rmzcc+8Gmwy2Ue2bNbcUgFnesN1EudoH8im0XTFKYu71IvS7m9TK0VB28TKMlfl7qohqesurRIY9pKoOIMqxdE1r7dK+yrck377UyTSpN6l36bcZrHNT59+VTNJPmitdJDIrvSH5a8yUqc/7mXj8udRuyLY8lj9T9MPy9+WaaH+42td+0EFXPv6b9NpNk7bZ/WaYda6rt4kmITlT9KBPv2y4StR3O8sO6p/+npfh0mQfhNpk99p/bcZ+mg6YRlFHqaxI/1p/U/Tbxp5mv5oHBrsq2vpTyXT9K9x0/WTpnzXcfofH13J6yQH/X9QuZsVkfadtW3yNj/dIDhu/zJIePw/fMxKrtcg6ub4kbXJDQ8OezT9/LpS82m4KgkOZG3506wt+KCkTcWsJ1/sCqNjWlycBhVnC/VuMtNyH3FSPrrRbD3zg4Kkk6NTXWtNPMFLu84D07jRZDZt8ltnfGf172/5GaPzp/YspN2rknofuQZHxXbVbLTXoAOVy3G883S7eh9V/j7w1iQv34EdKD9rmr2tWxouH93+1nTOn4ofzfdKTGk4IH7MmNn/4k69f554i77r7Wm9CxTj5R0KCrvE0972Zzl0dQS7Y+rhAao7MRiEqJa6k6aF42O1U6+uXzy+VueXK+t32jotKEpZXn2KrjNn3oPBJx28Myq3nITfkZ3xO9p9wvLveQueXE/X12Li2/ENTsPGp2/lcjysw43htD1fPdf+6+HH7Vk2cLxpIbKmfDuuKi1uXUex2lGL6hz3t4XlrH1tJo6btKel54rXnrb2LTA+H877qu6Ch4f4zdRHCe3taWs5bsu+N5b5pptcCqw65978ZZXg+niTp0MnMcWvYW+pT7lm+1pVkKY89RuTKvzyx5OhOovZKeX23ZNONpvOMMgeC3vWDnXXv+VzwO973Prp7P5H9zlVo+2Mw/Pk8frt8Olb/Vjavt1uX/yj5bRZvnxeLpdwuVqqYq1y0yx32xfLVYp9+PRPbzJ0hZrVs4Gi5aU6fHhUytpzkOozp6w/H6mWh/tjsX9GG2bH89VuPxTHb+VIXPz6fGs+Ev0sl6Kqguph+q1+lMtVvVUXDT6LLYqlKhNVq8RR8Uo8fou3Wqm1t6+qYup3fFV89QXaqL5M2/w0F23XRVXY7VC02jopm2CpRpsAG7V63EY7beZ5M/5DoVctnj9thZm77LHXXXLeeUQaDxPNPDsWwcG+dCePTu9lDIf8+/X7qhGrL3CsCY7OJ8eS3+rEIePe5s8K7hDpdpgbE/kF7tJfDh5qt6/L7Lhwcyd732w3jny+Vr0VeW++2Fo/6m+Kdm/wsvf37/6+XvWlwKaoxdOk/J5hd/HjY+/389J6m8/z1x+b06Fs9Kns0sWfLkC7fPbv1tuhHe9PQtlWgOJIt3iuuHH+OPJ9+8C+9H+yffVdLpdv0OPsOmzBcKl71vSX6qpTFabYqojj7A6xrnwjf7lkRRLfE3+pLMrhDxW+7zuedfT1+5S+jbY2ONobDm6f7j0r7UIdPJc9fNb7O96/vYzv6cYAAAAAAACc5fMfAAAAAAAAAAAAAAAAAAAAAAAAAIAXtjT1XfbgfACcn491cX7LJdU0pln+jdOL/jzl5L7j1/qZYINJiQPHZmK+VlPIBrMPZ2uhsyxZmh/5oDyYxbb+2+b/Mi9rXS7vX+Hj6+v9pkfWTH3dzIfdv14ntJZGPXt2M4d2+0jTblrt/ZMuF0lkTUau17KKq2pequuqpcqdLCk2bWddjeJj+9u4NdqsnGnh6SzWbWzhzMVt/GNdHsq5hYP5r/ekuBhqNjdlhlYL0uTvpuIPZt9Os2H5m/wm/QndqLz722++wsvtkz5I2AL183E0TU7KO48fL3mVWLVZs2nxJ5kdluqsDcf3tgXLYSUMVdXD5O9gdT+f+td+1SBSPfss57q/XMr49s03v9+eKmt7yrh9zu6/AAAAAAAAAAAAAMCy4ZeaF4Ocivd/AMBf5x8AAAAAAIBf5rZvZnDMI+83t3kXzEpzr77wpeq+evWXbYIbFEbDyJvf6bX5eZzxrUpn7nvIg/T3Mb1X5Z+NYV9vH8Ze3sN1fCPlrfun5tvS4WKUR1GUFn/yLv1X6aJpWmU2ajM6UuQ7z98W1YGWb81Zlnxyb9ljt9bPtoKnyzcwrdcWZbjERf0X/6IouE92We5ycRDZSjrzr41fHvfeY/3xwdpqKP98HJEGu82O/WGqvoXySPXScH8sE9q7YzcO3TU92Y7vu2210LlW7SXr7bgZfxtuMbPdvp1vl6fT30N5ozC77k8fxtMMwbstD29Dd7wf8QHT+xXvyWsZbk9e97dX363OlaJzoGUe40x5mNwffGl1On3ltbS5O3ZOltZj8/J/R8jbMXYhQHm4W1s/rrbBmH28fDOZb+KcT7ZLa2X8reK4eX/eKP9q6mXup8e0Q6cyH+WhKG2ORe1cBOl16xS9ClttMm6Y0XC9Hs3Hx/rxbUd7t0HjtXjqvFbZzEcHyNX0F/UFXVq/0v/7zje7PqjIsKAn+//e+rvZyfT3nn+MDu+dveclo8N+2lbonqLNzzByssB/mY3h50D/K4acPE3vfSRdTTIYJtfDBxdIukHmvvlcTX9lbFiqzNapSViukzl4gn1irpkX95rD09/Mp9nIV9qzDTLKyc70R7PfDN/Ol9PQbNT3IK5ii1vqf5iX8pUyE80ML0Gu8vL12eZY7R/LRZg2+O0XELpE07m0g+Vz89VM5iyaaf8kOElfvgAbzATUXMRMkmsXc/0vqc6Jq2j7zDarmhz0OXkNB+tzWqvDXjiQ5sl1a7y+Peky8X6H+mnH53PFD67LT2q9Py/d09Furv88HM2m9T/sEDelP2zzhfTuWP+TDz+G6VVHtaOXZ1/ODW3/kD3s1uuSYXvNnCb1bR0M/Guf6DY9od0Fq/nows537/EnyOChRuo6bzE2rg0DQaMe7AbXcPRJZuI7eGIzN7BsV+SxNAL3aZ4fr6+PQ43UDY3jJprZ3wbnnVsz7s7N2DlIsB+K71n+/V/i6NKvBoFuX5iWP4x/T/TdwFLHuBAfxyxU9I+tzvG4NXtVpf18t/7Mf2mq7JL5r+ElPWY8WXj7+F3S8aHs2bV8D49pKQAAuN2zz52BH2Py/U4AAADg9T37ggK/wrO7MQAAAAAAAADAX+vZXxzhh9rXf0b3L/v+/za2lenxnSuPFru/OWE5f1YcZ4V8OK1WW97VW5wvJf7d9QP3dOv9WRfmBXjY/zA9uv+vKKNLZm9QvUOTnfJpFrq1fMXolIV3yxzfOvOO5QcAAAAAAJ7M9X/gd9r/+eiJTQAAAAAAAAAA4GU88Us6P8GZ+pytY/X9em7bcwAAfqZHn26NXxmfjIUr4+Y+i0+rHAAAAAD44eK/0uHy31ZR1QwP7d+knSCmnfqhfT3ZjuSGPHxb+5fZekhXPWVucpFw/e3ln7Wa/iQTT3Rm5pbNbdIT28ylU+SuyGFa/ymk4TZpl0yY3Lny1LF30bdPZsox3qYJ39fk6jZn8mabooWX+2m0uFG0keJv2/IznH1sr28a//ghTk5XdW7TLtFRHuJ47nPeel6sURTPOEYC/EbtsDoZq8NV6e8deo9+g6mplG52xuH8ttcXfif8Ox1pvrLhhu2VRk/OPsDTHDr+vargMuvRt4mL11s6i9ddOu05QRnfo+e7hx9l8QORbXHxL7r3ZyeHc/CCH+LcoBo+14bW8qcIlg5eql5s/svGtf51rcP04bvXquUgmXQQyTDa0bBeZzBdW39Q5Ix/4LFXm1/PcPcGAACA32nnFXYAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAB4q3fTsHAIAAAAv6q+5fvDbywcAAAAAwPP4vh4AAAAAAABAZfsWKAAAwF/i2W9PeGXP7p0AfJdnH2EAAAAA4Id49qU8AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAeB35xupv9phCLkv+Ms+ubwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA4HX9AwAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAP+k6bNzAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAwCtI0/8AIUUfmw=='
-CHAR_CLASS_STRING = zlib.decompress(base64.b64decode(_compressed)).decode('ascii')
+_compressed_index = b'eJxjYGRiZmFlY+fg5OLm4eXjFxAUEhYRFBUTl5CUkpaRlZNXUFRSVlFVU9dQ1NTS1tHV0zdQF8QFDHHKkAuMjIGEiaCpmbmFpRUJ+qxtoMAWFxC0sxd0cHRydnF1c/cQ9PTy9vH18w8IDAoOCQ0Lj4iMio6JjYtPSASalZScEgsHIMNTY1GBoGBaLCEgKJieERubmYXDvdkgIieXoDGxgnn5cHYBFvnCouKS0rLyCnX1SjC/qroGTNfWxcbWNzTGqjepowDKoodeoBldoKUVq7o2fIa0o8ZHBzw+0UAn4VgYBaNgFIyCUTAKRsEoGAWjYGiCru6BdsHAApz9w5EBegbaAQMMegC76VQh'
+_compressed_pages = b'eJztXUluxCoTvkquYHOClrft1i+9zdshL58Ui/vvfoYCirnAbqe7k89R4gFqAopisPPvv4CvL/WT4EsIMQkN+OMxTfLWvQiT6LsIRTBlmPCXXCYmZrbI9Gxm0+MhNiHmxyIe8rTAe4K/Jd6TPbkPHu0bjQNywYn6UTTud3/xfXfJ7paDeaRPvr/vTgf305TJ0hnV++65GinuIDQc/1n4s5+DaCdZL8Ztu237fNs437dtEzcuMc83cbvduDzk4xjcnW1tyDQm4a1wmEST4rOlvNogyBAJ1DoYsszAEak3SIV88KaFTKHx3bg/sqGE4JyxiXfVJiEP88MBSxn2seLkgDy5/GEMExfyaYWexu5P8xIGkIlaBE+AsKIIUGff11WfKuW9LAtjSygfFy0BK4VRNf4xIC4LDxDoQySy70ym3zlfp6mcdPfp3RXmZwxW4yZT4+d8BFnambsoS9JGWmharqRgpjYsCc2oDewpGaeOUrdUi7j7C1aRilpmSmettzPDamzHNYOwlkwyglJg0yJMLu5NSOFvfyQT4O74W85WRCuP568ts4qgtHjAhMQ/1F8LYvjHtSzWX0z2AcrZZ/+UP9bf6lSwP1uM9ZEBFm9/ywcyc3tmnoSiuaoODFes/8oDeP6q4DUm5hsLwfzpfW/DFfEHoiBvan8r0AMqoSIhMA8C/9T+KX8o5JR/5IeCtlrjn2JN+S8Mqv4K+i0x/8fDaW5YBvU/MG7TENxXVlvkVh7nBOPyV0lw/9/dZ63LgkhD/7FbdmHnQAHU86VieY4fragjs/rz3SoeaAqGqbOXTSHq05gMg2S0YJpJpuQebFWH82Z14QNFeNI7GasBHXSLFAdyBgBhOchrBCean17yGUTxk41CbKtaTRtZUK9oH2XJLqgCqWvGiOG2Hkep3x1DE6FGYB36/6EGaG3uKrzuzX+Uz3go3it3hRLHDvGRQab9MQfTPgeG6KThqWkC0l+eoOgfiGCptb/KqbUHP5E7dtCuYwxS6CsXNBT6B12pq8+L/YuOryrPiWh1i1JLNfsyLZnIM2h8PBgZqJxJeoI48YiOBqw/ZQi6LsP2KjJv0wvCkDh8UdcstGHDndh4baz86+nj8lQFzJooEAP9CLMqxdyGRLWiSnPG9a1wvdt7GRqHYMOyMfVs2OZLII4HhTe1S467uCb3iBG1ptUktrpTqeSLLpkK05WTKt+ugeaHQaauTlz+CmuLCTmydU0rAvqYwFynLy/PYRgR9yGo/O7EYc/yCZNQUGhZBJiqf2Qd7HnH0dVJ+uHWaQC2MoZxYvy8nZ7fzFHKb/PR6EfXHK7nbZ5nfK2vNFUtDVy7/PJac/Tp+ZdH4row4HE20VS+Mulxr7TbGESvuew+HtHXYXuU7XNqIOvPq9U+hBxhK08sf203WBLc1NWkDWTc9M0c6lrbTQ+aN5lDXmkhdKmwSd5h8RCnalSD27c2jBnxaHpmgnIy05TwA5OWdUw6bTvVHyysTVQRlCwKCRpW7UejnJoyN+l3pa6iGD+10uSG/VScIrnDFTwuw5Q56yPQWZdOwtX8Xgahyz+v3utC1BsYakC986Av+VQMdBlnIx8VnEC0naa//LOEOrua9rwEYeLiJFAHm4Ce9RUdit9hY6M5zE5BN8DZ7/dn79fSm8JAVXm6qn1mbvD/oO7P4ibPNj7/BuHAHq3KlSY/XAJ7Pfq3NRwgxOcYeyuB9PTFWKkRP0V4Xhug8X9n0OytrtUAle1LWIL4yp1BfdGzLjqNzCVpjDaIOtRAdp53yeI59BWUKt2T6s/b42fImzjdl1ErQ29t6MzPqVGZS9UZy3VHfSePX55TjNfht+t/CKWmP7ai94ejGO+Pi/6tBLv+EtwT6aqN7wnze8n6IlG9lITWZ8ReS61WN84wK9bCRnxW/jkPt74yz/HKxLH1hj1Y2kD3DaMaD3g5Knx3iXM3rKAHnZKFXY4yi2J4dSyBLilVydTcue11YPvsUDiA7T9SwuVJfRy5WfoxnAwqtkLxP4VjMVVpiaEevvFo/+2I+sHog++h/iDv6h16pG/Pbt+siguqN/H+05xVQRLV8/ZrrpmtZj8lcFziF0I4Ei30b7YElVvBqbQdkr/BYz+epK0Xa8xu0XdTY3219ta1P5MEislsTcntRO8vgesRFmoxyRDdf345/vfLcaxm9te4K3lR4FfaHcyMn25RyEGHb8rZNxbc21DXIQ7VMn7/MqQvGRylOEqBVtoh9SkzE9+Kn0Qb0cawSa1DcLUtxPF/lV5HvaApGt93KK8FmETlrllpnsSWfUPrvZWclwMY81TqMDNpf2bWZ3xFEGqmM3qjrsInfy957YDH1z318WJYM6g/9QXZCBw1G0J7SJGduNO3wvbIzf7iHnTNGhzdPHsCWiU0Vqoea70cm/RtuqKwrm2Ltj4OfgzVUIY0/Y/pgAsmg7rweeJ4pAPpeIW0SMtp4yx6eflqNaaFQ9/i4AUY0Qer1NI4Y4OXgpWuLyaBd9LLw1G3w6eQwK3jtBgBAp/Vr19GeKCZZ+t4VfyPpnG4Pjf0r3JX0qc+vasrf+jXvcAX27m49mvw7hMHvnsBfSJ3VSfzeNT9O6G8bdLqQpaRVYspog6iyr8Ir2jpeaX++8qXfY4MiRUdrP9U+x3GIH9q/xt1bw7Ufjnq9rg1KEW1/Az7oMK/DA3301H/zIcrzu5JqyyRm6ynRxMEzsmcK2eVf8U3lIxpMbQIsSRrUKhN5Iq52Gq6l3/yPAGiUp42SSQJkX+0+hMOZxf04SUKLZnjiP1DWdQdJQSscCCphLqfLY5q/SirkBb48QG0Y8pzvNH12HpNsmaXKf/R7z+tue8/Bd9fAhHcLCL3X2x6FXTaM7VqWAsDcLEuLX99nLV+K9hxebf+eUx9NC+dWN3HpZSKdtj+Anuz4vvrxSIZZV3y5yfaP5n8D/npXq13evLlcKDsL2lhR+flcHllwiRf1sjx11b0oCbYJqj3Y+DKd7b/QQJ2FZKrvOprqDX6oQ/v4LBg77Nm6HUGNjnH0jZkHw+Ec4rn7eHt0VVIzjXGRZRpb0Hc2f5CTNLDhAy9Kz5Tf/oivuOvnYBrC6n+mD6FvHMshmKB3h/6UDD025oz9lvZWRW7vpl9JzHI/sKff7vGnoXw+VngcVP+aSufgWtK6jnoVfXT3PFvrwJHNW6lCvvv51ebltDxyK1XbR+cmw/C6Ldowm1VVt/qFH+J+bPtczaOjk8L6yKXeZje8q9Akcv9SwQSQBx1Gnzf7ah+snbueLQQDx1O1P+t8Nn60+vHQJaPwmmG9PSyPIj8/nAhLi6PtPx52v7wQwZxxkC1JqNrv/DHoFv/Y4bSPbz96+eMAe7LwG0iB2R4WvkrsZ5ZQ4+hsfz/rPpf5Z8I8YMYidybeTK70ob4cP2RZ87hW8/+X0EaJpYNZjemj6HuyNuTyu46mwfSe0tW84zI9pfHf185g6mYaWpw/LSc28hs7uBwFRz/QC6dM+pB4DWqyDWZcXFE4mz/Z8kmsuJHL7dr6Tz0RrBgFDc7Ec7vLS8cCXwmeopPFVxYXrzw/0/fDCjM6nUTRX/rUPS7DrZNKHpXz3e/HYoBcRvqnanp7Ni5W4IXDOIPQDefWtNazL/Z5MEts2EZKJhfsIXZp3f37NYyHuZf3K5ndDtq1kbA0kcDRvSN/2NEWLy/D0QP+6ag1f8jZE8W+MXw6fq9A06or78Zh9o/pUd5b1xn6RdFI0Lvn1HpwzVKltE/ifPeiPX/6e/P/Sw4/z9zew7U'
+PAGE_INDEX = zlib.decompress(base64.b64decode(_compressed_index))
+PAGES = zlib.decompress(base64.b64decode(_compressed_pages)).decode('ascii')
 
@@ -1,15 +1,21 @@
 """
 This gives other modules access to the gritty details about characters and the
 encodings that use them.
+
+The larger tables here, such as `CHAR_CLASS_STRING` and `HTML_ENTITIES`, are
+built the first time they're used, instead of when ftfy is imported, so that
+programs that only use part of ftfy don't pay for the rest. They're still
+available as attributes of this module. `build_tables` builds them all at
+once.
 """
 
+import functools
 import html
 import itertools
+import operator
 import re
+import sys
 import unicodedata
-import zlib
-
-from .char_classes import CHAR_CLASS_STRING
 
 # These are the encodings we will try to fix in ftfy, in the
 # order that they should be tried.
@@ -23,7 +29,27 @@ CHARMAP_ENCODINGS = [
     'cp437',
 ]
 
+# The tables that have been built, by the name of the function that builds them
+_TABLES = {}
+
+
+def _table(build):
+    """
+    Decorate a function that builds one of the tables here, so that the table
+    is only built once.
+    """
+    @functools.wraps(build)
+    def get_table():
+        try:
+            return _TABLES[build.__name__]
+        except KeyError:
+            table = _TABLES[build.__name__] = build()
+            return table
+
+    return get_table
+
 
+@_table
 def _build_regexes():
     """
     ENCODING_REGEXES contain reasonably fast ways to detect if we
@@ -51,9 +77,41 @@ def _build_regexes():
     return encoding_regexes
 
 
-ENCODING_REGEXES = _build_regexes()
+# The bit for each encoding in the bitmasks that `possible_encodings` returns
+ENCODING_BITS = {
+    encoding: 1 << bit for bit, encoding in enumerate(['ascii'] + CHARMAP_ENCODINGS)
+}
+_ALL_ENCODINGS_MASK = sum(ENCODING_BITS.values())
 
 
+@_table
+def _build_encoding_masks():
+    """
+    ENCODING_MASKS maps each character that can be encoded in at least one
+    of the encodings in ENCODING_REGEXES to a bitmask of which ones, where the
+    bits are given by ENCODING_BITS. It allows the same characters as
+    ENCODING_REGEXES do.
+    """
+    encoding_masks = {}
+    for encoding, bit in ENCODING_BITS.items():
+        if encoding == 'ascii':
+            chars = [chr(codept) for codept in range(0x80)]
+        else:
+            byte_range = bytes(list(range(0x80, 0x100)) + [0x1a])
+            charlist = byte_range.decode(encoding)
+            chars = [chr(codept) for codept in range(0x80) if codept != 0x1a]
+            chars.extend(charlist)
+        for char in chars:
+            encoding_masks[char] = encoding_masks.get(char, 0) | bit
+    return encoding_masks
+
+
+# How many characters `possible_encodings` looks at before checking whether
+# any encoding is still possible
+_ENCODING_CHUNK_SIZE = 1024
+
+
+@_table
 def _build_html_entities():
     entities = {}
     # Create a dictionary based on the built-in HTML5 entity dictionary.
@@ -75,9 +133,9 @@ def _build_html_entities():
 
 
 HTML_ENTITY_RE = re.compile(r"&#?[0-9A-Za-z]{1,24};")
-HTML_ENTITIES = _build_html_entities()
 
 
+@_table
 def _build_utf8_punct_regex():
     """
     Recognize UTF-8 mojibake that's so blatant that we can fix it even when the
@@ -100,9 +158,6 @@ def _build_utf8_punct_regex():
     return re.compile(obvious_utf8)
 
 
-PARTIAL_UTF8_PUNCT_RE = _build_utf8_punct_regex()
-
-
 # Recognize UTF-8 sequences that would be valid if it weren't for a b'\xa0'
 # that some Windows-1252 program converted to a plain space.
 #
@@ -133,6 +188,12 @@ ALTERED_UTF8_RE = re.compile(
     b'|[\xf0-\xf4][\x80-\xbf][\x80-\xbf][ ]'
 )
 
+# Runs of text that could be mojibake, which `fixes.fix_encoding_spans` fixes
+# separately. Mojibake is made of non-ASCII characters, except for the spaces
+# that ALTERED_UTF8_RE looks for. We include a space at the end of a run, but
+# not a space in the middle, which would more often join two separate words.
+MOJIBAKE_SPAN_RE = re.compile('[^\x00-\x7f]+ ?')
+
 # This expression matches UTF-8 and CESU-8 sequences where some of the
 # continuation bytes have been lost. The byte 0x1a (sometimes written as ^Z) is
 # used within ftfy to represent a byte that produced the replacement character
@@ -151,8 +212,14 @@ LOSSY_UTF8_RE = re.compile(
 )
 
 # These regexes match various Unicode variations on single and double quotes.
-SINGLE_QUOTE_RE = re.compile('[\u02bc\u2018-\u201b]')
-DOUBLE_QUOTE_RE = re.compile('[\u201c-\u201f]')
+SINGLE_QUOTE_CHARS = '\u02bc\u2018\u2019\u201a\u201b'
+DOUBLE_QUOTE_CHARS = '\u201c\u201d\u201e\u201f'
+SINGLE_QUOTE_RE = re.compile('[' + SINGLE_QUOTE_CHARS + ']')
+DOUBLE_QUOTE_RE = re.compile('[' + DOUBLE_QUOTE_CHARS + ']')
+
+# The characters that `ftfy.fixes.fix_line_breaks` replaces with '\n'. (It
+# also replaces the two-character sequence CRLF.)
+LINE_BREAK_CHARS = '\r\u2028\u2029\x85'
 
 # This regex matches C1 control characters, which occupy some of the positions
 # in the Latin-1 character map that Windows assigns to other characters instead.
@@ -167,7 +234,119 @@ def possible_encoding(text, encoding):
     In other words, check whether it can be encoded in that encoding, possibly
     sloppily.
     """
-    return bool(ENCODING_REGEXES[encoding].match(text))
+    return bool(_build_regexes()[encoding].match(text))
+
+
+def possible_encodings(text):
+    """
+    Find all the encodings that `possible_encoding` would accept for this
+    text, at once, returning a bitmask made of the values in ENCODING_BITS.
+
+    This looks up each distinct character in the text once, instead of
+    scanning the text once per encoding. The text is looked at in chunks, so
+    that we can stop early when no encoding is possible.
+
+        >>> mask = possible_encodings('Ã©')
+        >>> bool(mask & ENCODING_BITS['latin-1'])
+        True
+        >>> bool(mask & ENCODING_BITS['ascii'])
+        False
+        >>> possible_encodings('漢字')
+        0
+    """
+    if is_ascii(text):
+        if '\x1a' in text:
+            return _build_encoding_masks()['\x1a']
+        return _ALL_ENCODINGS_MASK
+    mask = _ALL_ENCODINGS_MASK
+    masks = _build_encoding_masks()
+    for start in range(0, len(text), _ENCODING_CHUNK_SIZE):
+        chunk = text[start:start + _ENCODING_CHUNK_SIZE]
+        mask = functools.reduce(
+            operator.and_,
+            map(masks.get, set(chunk), itertools.repeat(0)),
+            mask,
+        )
+        if not mask:
+            break
+    return mask
+
+
+def char_class_regex(chars):
+    r"""
+    Make a compiled regex that matches any single character in `chars`,
+    written as a character class with runs of consecutive codepoints
+    collapsed into ranges.
+
+    >>> char_class_regex('abcxz&').pattern
+    '[\\&a-cxz]'
+    """
+    codepts = sorted(set(map(ord, chars)))
+    pieces = []
+    start = 0
+    while start < len(codepts):
+        end = start
+        while end + 1 < len(codepts) and codepts[end + 1] == codepts[end] + 1:
+            end += 1
+        first = re.escape(chr(codepts[start]))
+        if end - start >= 2:
+            pieces.append(first + '-' + re.escape(chr(codepts[end])))
+        else:
+            pieces.extend(re.escape(chr(c)) for c in codepts[start:end + 1])
+        start = end + 1
+    return re.compile('[' + ''.join(pieces) + ']')
+
+
+@_table
+def _build_mojibake_trigger_regex():
+    """
+    Build a regex that finds something in every string that `fix_encoding`
+    could change. Strings that it doesn't match can be left alone without
+    running `fix_encoding` at all.
+
+    When `fix_encoding` changes text, either it decodes some bytes as UTF-8,
+    or it turns C1 control characters into Windows-1252 characters. The text
+    can only decode as UTF-8 if some character encodes as a UTF-8 lead byte
+    (0xc0 to 0xff), followed by a character that encodes as a continuation
+    byte (0x80 to 0xbf) -- or by a space that could have been 0xa0, or by
+    U+FFFD, which the sloppy codecs encode as 0x1a. We allow the two
+    characters to come from different encodings, which only makes the regex
+    match more than it has to.
+    """
+    lead_chars = set()
+    continuation_chars = set(' \ufffd')
+    for encoding in CHARMAP_ENCODINGS:
+        lead_chars.update(bytes(range(0xc0, 0x100)).decode(encoding))
+        continuation_chars.update(bytes(range(0x80, 0xc0)).decode(encoding))
+    return re.compile(
+        '[\x80-\x9f]|{}{}'.format(
+            char_class_regex(lead_chars).pattern,
+            char_class_regex(continuation_chars).pattern,
+        )
+    )
+
+
+if hasattr(str, 'isascii'):
+    is_ascii = str.isascii
+else:
+    def is_ascii(text):
+        """
+        Check whether a string is entirely ASCII. (This is `str.isascii`,
+        which we define here for Python versions before 3.7.)
+        """
+        return possible_encoding(text, 'ascii')
+
+
+if hasattr(unicodedata, 'is_normalized'):
+    is_normalized = unicodedata.is_normalized
+else:
+    def is_normalized(form, text):
+        """
+        Check whether a string is already in the Unicode normalization form
+        `form`. (This is `unicodedata.is_normalized`, which we define here for
+        Python versions before 3.8.)
+        """
+        return unicodedata.normalize(form, text) == text
 
 
 def chars_to_classes(string):
@@ -176,10 +355,67 @@ def chars_to_classes(string):
     classes it's in.
 
     See build_data.py for where this data comes from and what it means.
+
+    Characters below `_CLASS_TABLE_SIZE`, which are almost all the characters
+    ftfy sees, are looked up in one pass with a table of their classes. Any
+    other characters are left as they are by that pass, and need a second
+    pass if there are any.
     """
-    return string.translate(CHAR_CLASS_STRING)
+    classes = string.translate(_build_class_table())
+    if is_ascii(classes):
+        return classes
+    return _HIGH_CHAR_RE.sub(_high_char_class, classes)
+
+
+# The number of codepoints, starting from U+0000, that have their classes in
+# the translate table that `chars_to_classes` uses. This covers the Basic
+# Multilingual Plane and the Supplementary Multilingual Plane, which includes
+# emoji. The planes above it are mostly unassigned, so it would be a waste of
+# memory to include them.
+_CLASS_TABLE_SIZE = 0x20000
+_HIGH_CHAR_RE = re.compile('[\U00020000-\U0010ffff]')
 
 
+@_table
+def _build_class_table():
+    """
+    Build the translate table for `chars_to_classes`: a string of the classes
+    of the first `_CLASS_TABLE_SIZE` codepoints. It takes an eighth of the
+    memory of a table for all of Unicode.
+    """
+    from ftfy.char_classes import PAGE_INDEX, PAGES
+
+    return ''.join(
+        PAGES[page * 256:page * 256 + 256]
+        for page in PAGE_INDEX[:_CLASS_TABLE_SIZE >> 8]
+    )
+
+
+def _high_char_class(match):
+    """
+    Get the class of a character above `_CLASS_TABLE_SIZE`, which is matched
+    by `_HIGH_CHAR_RE`, from the table of pages in char_classes.py.
+    """
+    from ftfy.char_classes import PAGE_INDEX, PAGES
+
+    codept = ord(match.group())
+    return PAGES[PAGE_INDEX[codept >> 8] * 256 + (codept & 0xff)]
+
+
+@_table
+def _load_char_classes():
+    """
+    Build CHAR_CLASS_STRING, the class of every codepoint as one string,
+    from the table of pages in char_classes.py. ftfy itself doesn't need
+    this, and it's much larger than the table of pages, so it's only built
+    if it's asked for.
+    """
+    from ftfy.char_classes import PAGE_INDEX, PAGES
+
+    return ''.join(PAGES[page * 256:page * 256 + 256] for page in PAGE_INDEX)
+
+
+@_table
 def _build_control_char_mapping():
     """
     Build a translate mapping that strips likely-unintended control characters.
@@ -204,9 +440,6 @@ def _build_control_char_mapping():
     return control_chars
 
 
-CONTROL_CHARS = _build_control_char_mapping()
-
-
 # A translate mapping that breaks ligatures made of Latin letters. While
 # ligatures may be important to the representation of other languages, in Latin
 # letters they tend to represent a copy/paste error. It omits ligatures such
@@ -244,6 +477,7 @@ LIGATURES = {
 }
 
 
+@_table
 def _build_width_map():
     """
     Build a translate mapping that replaces halfwidth and fullwidth forms
@@ -261,4 +495,54 @@ def _build_width_map():
     return width_map
 
 
-WIDTH_MAP = _build_width_map()
+# The tables that are built the first time they're used, and the functions
+# that build them. The functions cache what they return. Other modules look
+# up the tables as attributes of this module, but the functions in this
+# module call the builders, because looking up a global name here doesn't
+# go through __getattr__.
+_LAZY_TABLES = {
+    'CHAR_CLASS_STRING': _load_char_classes,
+    'CONTROL_CHARS': _build_control_char_mapping,
+    'ENCODING_MASKS': _build_encoding_masks,
+    'ENCODING_REGEXES': _build_regexes,
+    'HTML_ENTITIES': _build_html_entities,
+    'MOJIBAKE_TRIGGER_RE': _build_mojibake_trigger_regex,
+    'PARTIAL_UTF8_PUNCT_RE': _build_utf8_punct_regex,
+    'WIDTH_MAP': _build_width_map,
+}
+
+
+def __getattr__(name):
+    """
+    Build one of the tables in _LAZY_TABLES when it's first looked up as an
+    attribute of this module. (See PEP 562.) After that, it's an ordinary
+    attribute.
+    """
+    if name not in _LAZY_TABLES:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)
+        )
+    table = globals()[name] = _LAZY_TABLES[name]()
+    return table
+
+
+def build_tables():
+    """
+    Build all the tables that ftfy uses now, instead of when they're first
+    used.
+
+    A process that's going to fork worker processes can call this first, so
+    that the workers share the memory that the tables are in, instead of each
+    building its own copy. CHAR_CLASS_STRING isn't built, because ftfy
+    doesn't use it.
+    """
+    for name, build in _LAZY_TABLES.items():
+        if name != 'CHAR_CLASS_STRING':
+            build()
+    _build_class_table()
+
+
+if sys.version_info < (3, 7):
+    # Modules can't have a __getattr__ before Python 3.7, so we build the
+    # tables now
+    globals().update((name, build()) for name, build in _LAZY_TABLES.items())
@@ -5,6 +5,7 @@ import os
 import sys
 
 from ftfy import __version__, fix_file
+from ftfy.profiling import Profile
 
 ENCODE_ERROR_TEXT_UNIX = """ftfy error:
 Unfortunately, this output stream does not support Unicode.
@@ -34,6 +35,9 @@ to guess, if you're desperate. Otherwise, give the encoding name with the
 `-e` option, such as `ftfy -e latin-1`.
 """
 
+# How many bytes of input to read and fix at a time
+BUFFER_SIZE = 2 ** 20
+
 SAME_FILE_ERROR_TEXT = """ftfy error:
 Can't read and write the same file. Please output to a new file instead.
 """
@@ -91,6 +95,20 @@ def main():
         "is to decode them, as long as no HTML tags "
         "have appeared in the file.",
     )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=1,
+        help='The number of processes to fix text with. Defaults to 1. '
+        'Use 0 for one process per CPU.',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Print a table of how long each step of fixing took to "
+        "standard error. This runs in a single process, ignoring -j.",
+    )
 
     args = parser.parse_args()
 
@@ -122,13 +140,34 @@ def main():
     else:
         fix_entities = 'auto'
 
+    jobs = args.jobs
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if args.profile:
+        jobs = 1
+    lines = fix_file(
+        file,
+        encoding=encoding,
+        fix_entities=fix_entities,
+        normalization=normalization,
+        buffer_size=BUFFER_SIZE,
+        workers=jobs,
+    )
+
+    if args.profile:
+        with Profile() as profile:
+            write_lines(lines, outfile, encoding)
+        sys.stderr.write(profile.summary() + '\n')
+    else:
+        write_lines(lines, outfile, encoding)
+
+
+def write_lines(lines, outfile, encoding):
+    """
+    Write fixed lines of text to the output, or explain why we can't.
+    """
     try:
-        for line in fix_file(
-            file,
-            encoding=encoding,
-            fix_entities=fix_entities,
-            normalization=normalization,
-        ):
+        for line in lines:
             try:
                 outfile.write(line)
             except UnicodeEncodeError:
@@ -141,6 +180,5 @@ def main():
         sys.stderr.write(DECODE_ERROR_TEXT % (encoding, err))
         sys.exit(1)
 
-
 if __name__ == '__main__':
     main()
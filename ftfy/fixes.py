@@ -4,25 +4,28 @@ can perform.
 """
 
 import codecs
+import functools
 import html
 import re
 import warnings
 
-from ftfy.badness import text_cost
+from ftfy import chardata
+from ftfy.badness import segmented_text_cost, text_cost
 from ftfy.chardata import (
     ALTERED_UTF8_RE,
     C1_CONTROL_RE,
     CHARMAP_ENCODINGS,
-    CONTROL_CHARS,
+    DOUBLE_QUOTE_CHARS,
     DOUBLE_QUOTE_RE,
-    HTML_ENTITIES,
+    ENCODING_BITS,
     HTML_ENTITY_RE,
     LIGATURES,
+    LINE_BREAK_CHARS,
     LOSSY_UTF8_RE,
-    PARTIAL_UTF8_PUNCT_RE,
+    MOJIBAKE_SPAN_RE,
+    SINGLE_QUOTE_CHARS,
     SINGLE_QUOTE_RE,
-    WIDTH_MAP,
-    possible_encoding,
+    possible_encodings,
 )
 
 BYTES_ERROR_TEXT = """Hey wait, this isn't Unicode.
@@ -46,7 +49,7 @@ If you're confused by this, please read the Python Unicode HOWTO:
 """
 
 
-def fix_encoding(text):
+def fix_encoding(text, plan_cache=None):
     r"""
     Fix text with incorrectly-decoded garbage ("mojibake") whenever possible.
 
@@ -113,11 +116,66 @@ def fix_encoding(text):
 
     The best version of the text is found using
     :func:`ftfy.badness.text_cost`.
+
+    If you give a :class:`ftfy.caching.PlanCache` as `plan_cache`, the plans
+    that fixed text before are tried first. See `fix_encoding_and_explain`.
     """
-    text, _ = fix_encoding_and_explain(text)
+    text, _ = fix_encoding_and_explain(text, plan_cache)
     return text
 
 
+def fix_encoding_spans(text, plan_cache=None):
+    """
+    Fix the encoding of text like `fix_encoding` does, and then fix the
+    encoding of each run of non-ASCII characters that's left on its own.
+
+    This can fix text that's been put together from pieces with different
+    problems, which `fix_encoding` has to leave alone because no one plan
+    works for all of it:
+
+        >>> fix_encoding_spans('Un café, ou un cafÃ©?')
+        'Un café, ou un café?'
+
+    Each run is judged along with the two characters on each side of it,
+    which is all the context that :func:`ftfy.badness.text_cost` looks at. A
+    run that comes up more than once, in the same context, is only fixed
+    once. Only the runs that could be mojibake are looked at, and the ASCII
+    text between them is left as it is.
+
+    The `plan_cache`, if given, is used for fixing the whole text.
+    """
+    text, _ = fix_encoding_and_explain(text, plan_cache)
+    fixed_spans = {}
+
+    def fix_span(match):
+        "Fix the encoding of one run of text."
+        span = match.group()
+        if not chardata.MOJIBAKE_TRIGGER_RE.search(span):
+            return span
+        start, end = match.span()
+        key = (text[max(start - 2, 0):start], span, text[end:end + 2])
+        fixed = fixed_spans.get(key)
+        if fixed is None:
+            fixed = _fix_span_in_context(*key)
+            fixed_spans[key] = fixed
+        return fixed
+
+    return MOJIBAKE_SPAN_RE.sub(fix_span, text)
+
+
+def _fix_span_in_context(left, span, right):
+    """
+    Fix the encoding of a run of text that appears between `left` and
+    `right`, which are taken into account in its cost.
+    """
+    encodings = possible_encodings(span)
+    if encodings & ENCODING_BITS['ascii'] or (
+        not encodings and not chardata.PARTIAL_UTF8_PUNCT_RE.search(span)
+    ):
+        return span
+    return _search_for_plan(span, left, right)[0]
+
+
 def fix_text_encoding(text):
     """
     A deprecated name for :func:`ftfy.fixes.fix_encoding`.
@@ -139,23 +197,125 @@ ENCODING_COSTS = {
 }
 
 
-def fix_encoding_and_explain(text):
+def fix_encoding_and_explain(text, plan_cache=None, last_plan=None):
     """
     Re-decodes text that has been decoded incorrectly, and also return a
     "plan" indicating all the steps required to fix it.
 
     The resulting plan could be used with :func:`ftfy.fixes.apply_plan`
     to fix additional strings that are broken in the same way.
+
+    A :class:`ftfy.caching.PlanCache` given as `plan_cache` remembers the
+    plans that fixed text, keyed on the non-ASCII characters in the text and
+    the encodings it could be in. When text with the same signature comes up
+    again, its plan is tried first. It's used if it applies cleanly and it
+    lowers the cost of the text by as much as the plan costs, which is the
+    same test that a plan found by searching has to pass. Otherwise, we
+    search for a plan as usual.
+
+    A plan from the cache is good enough, but it isn't necessarily the plan
+    that searching would have found, so text can come out differently with a
+    cache than without one.
+
+    `last_plan` is a plan that fixed nearby text, such as the previous line
+    of a document. If it's given, it's tried as well, and the text it
+    produces is fixed further if it can be. Its result is used if the plan
+    applies cleanly, lowers the cost of the text by as much as the plan costs,
+    and comes out with a lower cost, counting the plans, than what we'd get
+    without it.
     """
+    if isinstance(text, bytes):
+        raise UnicodeError(BYTES_ERROR_TEXT)
+
+    # Text that's ASCII, or that has no characters that any of our encodings
+    # could have decoded from a high byte, has no step to take.
+    encodings = possible_encodings(text)
+    if encodings & ENCODING_BITS['ascii'] or (
+        not encodings and not chardata.PARTIAL_UTF8_PUNCT_RE.search(text)
+    ):
+        return text, []
+
+    fixed, plan = _fix_with_cache(text, encodings, plan_cache)
+    if last_plan:
+        carried = _try_plan(text, last_plan, _plan_cost(last_plan))
+        if carried is not None:
+            carried, more_plan = _search_for_plan(carried)
+            carried_plan = list(last_plan) + more_plan
+            if (
+                text_cost(carried) + _plan_cost(carried_plan)
+                < text_cost(fixed) + _plan_cost(plan)
+            ):
+                return carried, carried_plan
+    return fixed, plan
+
+
+def _fix_with_cache(text, encodings, plan_cache):
+    """
+    Fix the encoding of text that could be mojibake in `encodings`, trying
+    the plan from `plan_cache` for text like it first, if there's a cache.
+    """
+    if plan_cache is None:
+        return _search_for_plan(text)
+
+    signature = (frozenset(char for char in set(text) if char >= '\x80'), encodings)
+    plan = plan_cache.get(signature)
+    if plan is not None:
+        fixed = _try_plan(text, plan, _plan_cost(plan))
+        if fixed is not None:
+            return fixed, plan
+        plan_cache.rejected += 1
+    fixed, plan = _search_for_plan(text)
+    if plan:
+        plan_cache.put(signature, plan)
+    return fixed, plan
+
+
+def _plan_cost(plan):
+    """
+    The cost of the steps in a plan, from ENCODING_COSTS.
+    """
+    return sum(step[2] for step in plan)
+
+
+def _try_plan(text, plan, plan_cost):
+    """
+    Apply a plan that fixed other text, returning the fixed text if the plan
+    works and lowers the cost of the text by more than `plan_cost`, or None
+    otherwise.
+    """
+    try:
+        fixed = apply_plan(text, plan)
+    except UnicodeError:
+        return None
+    if text_cost(fixed) + plan_cost < text_cost(text):
+        return fixed
+    return None
+
+
+def _search_for_plan(text, left='', right=''):
+    """
+    Find the best version of text by taking steps of fixing it until they
+    stop changing it, returning that version and the plan that produced it.
+
+    The cost of each version is measured with `left` and `right` around it.
+    """
+    # The versions of the text we try are often mostly the same, so we keep
+    # the costs of parts of them that we've seen. See
+    # `ftfy.badness.segmented_text_cost`.
+    cost_cache = {}
     best_version = text
-    best_cost = text_cost(text)
+    best_cost = segmented_text_cost(left + text + right, cost_cache)
     best_plan = []
     plan_so_far = []
     while True:
         prevtext = text
         text, plan = fix_one_step_and_explain(text)
+        if text == prevtext and not plan:
+            # This version has the same cost as the last one, which we've
+            # already compared
+            return best_version, best_plan
         plan_so_far.extend(plan)
-        cost = text_cost(text)
+        cost = segmented_text_cost(left + text + right, cost_cache)
         for _, _, step_cost in plan_so_far:
             cost += step_cost
 
@@ -178,8 +338,11 @@ def fix_one_step_and_explain(text):
     if len(text) == 0:
         return text, []
 
+    # Find all the encodings the text could be encoded in, in one pass.
+    encodings = possible_encodings(text)
+
     # The first plan is to return ASCII text unchanged.
-    if possible_encoding(text, 'ascii'):
+    if encodings & ENCODING_BITS['ascii']:
         return text, []
 
     # As we go through the next step, remember the possible encodings
@@ -191,7 +354,7 @@ def fix_one_step_and_explain(text):
     # a single-byte encoding instead. When these cases can be fixed, they
     # are usually the correct thing to do, so try them next.
     for encoding in CHARMAP_ENCODINGS:
-        if possible_encoding(text, encoding):
+        if encodings & ENCODING_BITS[encoding]:
             encoded_bytes = text.encode(encoding)
             encode_step = ('encode', encoding, ENCODING_COSTS.get(encoding, 0))
             transcode_steps = []
@@ -225,7 +388,7 @@ def fix_one_step_and_explain(text):
                 possible_1byte_encodings.append(encoding)
 
     # Look for a-hat-euro sequences that remain, and fix them in isolation.
-    if PARTIAL_UTF8_PUNCT_RE.search(text):
+    if chardata.PARTIAL_UTF8_PUNCT_RE.search(text):
         steps = [('transcode', 'fix_partial_utf8_punct_in_1252', 1)]
         fixed = fix_partial_utf8_punct_in_1252(text)
         return fixed, steps
@@ -304,8 +467,8 @@ def _unescape_fixup(match):
     if possible.
     """
     text = match.group(0)
-    if text in HTML_ENTITIES:
-        return HTML_ENTITIES[text]
+    if text in chardata.HTML_ENTITIES:
+        return chardata.HTML_ENTITIES[text]
     elif text.startswith('&#'):
         unescaped = html.unescape(text)
 
@@ -428,7 +591,7 @@ def fix_character_width(text):
         >>> print(fix_character_width("Ｕﾀｰﾝ"))   # this means "U-turn"
         Uターン
     """
-    return text.translate(WIDTH_MAP)
+    return text.translate(chardata.WIDTH_MAP)
 
 
 def fix_line_breaks(text):
@@ -551,7 +714,7 @@ def remove_control_chars(text):
     - Control characters that affect glyph rendering, such as joiners and
       right-to-left marks (U+200C to U+200F, U+202A to U+202E)
     """
-    return text.translate(CONTROL_CHARS)
+    return text.translate(chardata.CONTROL_CHARS)
 
 
 def remove_bom(text):
@@ -565,6 +728,81 @@ def remove_bom(text):
     return text.lstrip(chr(0xfeff))
 
 
+# The fixes that replace or remove individual characters, in the order that
+# `fix_text` applies them. `make_character_fixer` combines any subset of them.
+CHARACTER_FIXES = {
+    'fix_latin_ligatures': fix_latin_ligatures,
+    'fix_character_width': fix_character_width,
+    'uncurl_quotes': uncurl_quotes,
+    'fix_line_breaks': fix_line_breaks,
+    'remove_control_chars': remove_control_chars,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def character_fix_table(names):
+    """
+    Build the `str.translate` table that applies some of the fixes that work on
+    one character at a time, all at once.
+
+    `names` is a tuple of names from `CHARACTER_FIXES`. We build the table by
+    running each character that any of these fixes could affect through all
+    of them, in order, and keeping the ones that changed. This doesn't account
+    for CRLF; see `make_character_fixer`.
+    """
+    steps = [CHARACTER_FIXES[name] for name in CHARACTER_FIXES if name in names]
+    candidates = (
+        set(LIGATURES)
+        | set(chardata.WIDTH_MAP)
+        | set(chardata.CONTROL_CHARS)
+        | set(map(ord, SINGLE_QUOTE_CHARS + DOUBLE_QUOTE_CHARS + LINE_BREAK_CHARS))
+    )
+    table = {}
+    for codept in candidates:
+        char = chr(codept)
+        fixed = char
+        for step in steps:
+            fixed = step(fixed)
+        if fixed != char:
+            table[codept] = fixed or None
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def make_character_fixer(names):
+    r"""
+    Combine some of the fixes that work on one character at a time into a
+    single function, which makes one pass over the text instead of one pass
+    per fix.
+
+    `names` is a tuple of names from `CHARACTER_FIXES`. The combined function
+    gives the same result as applying those fixes in the order that
+    `fix_text` applies them. It translates every character through the table
+    from `character_fix_table`. The only fix that looks at more than one
+    character, replacing CRLF with LF, is done before translating.
+
+        >>> fixer = make_character_fixer(('fix_latin_ligatures', 'uncurl_quotes'))
+        >>> print(fixer('“ﬂuﬃ”'))
+        "fluffi"
+
+    Returns None when `names` is empty, because there would be nothing to do.
+    """
+    if not names:
+        return None
+    table = character_fix_table(names)
+
+    if 'fix_line_breaks' in names:
+        def fix_characters(text):
+            "Apply the combined character fixes, including CRLF."
+            return text.replace('\r\n', '\n').translate(table)
+    else:
+        def fix_characters(text):
+            "Apply the combined character fixes."
+            return text.translate(table)
+
+    return fix_characters
+
+
 # Define a regex to match valid escape sequences in Python string literals.
 ESCAPE_SEQUENCE_RE = re.compile(
     r'''
@@ -727,7 +965,7 @@ def fix_partial_utf8_punct_in_1252(text):
         return match.group(0).encode('sloppy-windows-1252').decode('utf-8')
 
     text = C1_CONTROL_RE.sub(latin1_to_w1252, text)
-    return PARTIAL_UTF8_PUNCT_RE.sub(w1252_to_utf8, text)
+    return chardata.PARTIAL_UTF8_PUNCT_RE.sub(w1252_to_utf8, text)
 
 
 TRANSCODERS = {
@@ -0,0 +1,138 @@
+"""
+Find out where ftfy spends its time.
+
+While a `Profile` is active, ftfy records how long each step of fixing takes,
+how often each step runs and changes the text, and how many passes it takes
+to fix each segment:
+
+    >>> import ftfy
+    >>> with Profile() as profile:
+    ...     fixed = ftfy.fix_text('schÃ¶n &amp; ﬁne')
+    >>> profile.steps['unescape_html'].changed
+    1
+    >>> profile.segments, profile.passes
+    (1, 3)
+
+`print(profile.summary())` shows all of this as a table.
+
+Profiling changes some global state, so it covers all the threads in this
+process, and it isn't meant to be used from more than one thread at a time.
+Text that's fixed in other processes, such as by :func:`ftfy.fix_texts`, isn't
+profiled. When no Profile is active, ftfy does only the work of checking that.
+"""
+import time
+
+import ftfy
+
+# The Profile that's currently recording, if any
+_active = None
+
+
+class StepStats:
+    """
+    What a Profile has recorded about one step:
+
+    - `calls`: how many times the step ran
+    - `changed`: how many of those times it changed the text
+    - `chars_changed`: the total length of the parts of the text it changed,
+      counting whichever is longer of the old and new parts
+    - `time`: the total time it took, in seconds
+    """
+
+    __slots__ = ('calls', 'changed', 'chars_changed', 'time')
+
+    def __init__(self):
+        self.calls = 0
+        self.changed = 0
+        self.chars_changed = 0
+        self.time = 0.0
+
+    def __repr__(self):
+        return 'StepStats(calls=%d, changed=%d, chars_changed=%d, time=%f)' % (
+            self.calls,
+            self.changed,
+            self.chars_changed,
+            self.time,
+        )
+
+
+class Profile:
+    """
+    Records what ftfy does while it's active, which is inside a `with`
+    statement. A Profile can be used again to add to what it has recorded.
+
+    - `steps` is a dictionary from the name of each step to its `StepStats`.
+      The steps that `ftfy.fix_text` runs are named after its options, except
+      that the fixes that replace individual characters are combined into one
+      step called 'fix_characters'.
+    - `segments` is the number of segments that had something to fix. Text
+      that obviously doesn't need fixing isn't counted.
+    - `passes` is the number of passes over the steps that those segments
+      took, until they stopped changing.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.segments = 0
+        self.passes = 0
+        self._previous = None
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = self._previous
+        self._previous = None
+
+    def run_step(self, step, text):
+        """
+        Run one step of fixing on some text, recording how it went.
+        """
+        stats = self.steps.get(step.name)
+        if stats is None:
+            stats = self.steps[step.name] = StepStats()
+        start = time.perf_counter()
+        fixed = step.function(text)
+        stats.time += time.perf_counter() - start
+        stats.calls += 1
+        if fixed != text:
+            stats.changed += 1
+            stats.chars_changed += _changed_length(text, fixed)
+        return fixed
+
+    def summary(self):
+        """
+        Describe what was recorded as a table, with the slowest steps first.
+        """
+        lines = [
+            '%-24s %10s %10s %14s %10s'
+            % ('step', 'calls', 'changed', 'chars changed', 'seconds')
+        ]
+        by_time = sorted(self.steps.items(), key=lambda item: -item[1].time)
+        for name, stats in by_time:
+            lines.append(
+                '%-24s %10d %10d %14d %10.4f'
+                % (name, stats.calls, stats.changed, stats.chars_changed, stats.time)
+            )
+        total = sum(stats.time for stats in self.steps.values())
+        lines.append(
+            '%d segments fixed in %d passes, %.4f seconds in steps'
+            % (self.segments, self.passes, total)
+        )
+        return '\n'.join(lines)
+
+
+def _changed_length(old, new):
+    """
+    Get the length of the part of `old` or `new`, whichever is longer, that's
+    left when their common prefix and suffix are removed.
+
+        >>> _changed_length('schÃ¶n', 'schön')
+        2
+    """
+    prefix, suffix = ftfy._common_affixes(old, new)
+    return max(len(old), len(new)) - prefix - suffix
@@ -0,0 +1,94 @@
+import sys
+import pytest
+
+if sys.version_info < (3, 7):
+    pytest.skip("ftfy.aio requires Python 3.7", allow_module_level=True)
+
+from ftfy import aio, fix_file, fix_text
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import io
+import json
+import os
+
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, 'test_cases.json')
+TEST_DATA = json.load(open(TEST_FILENAME, encoding='utf-8'))
+TEST_TEXT = ''.join(case['original'] + '\n' for case in TEST_DATA)
+
+
+class ChunkReader:
+    """
+    A stream with an asynchronous `read` method, like asyncio.StreamReader.
+    """
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size):
+        return self.stream.read(size)
+
+
+async def iterate_chunks(data, size):
+    for pos in range(0, len(data), size):
+        yield data[pos:pos + size]
+
+
+async def collect(lines):
+    return [line async for line in lines]
+
+
+@pytest.mark.parametrize("slice_size", [1, 100, 2 ** 16])
+def test_fix_text(slice_size):
+    for options in [{}, {'uncurl_quotes': False}]:
+        fixed = asyncio.run(aio.fix_text(TEST_TEXT, slice_size=slice_size, **options))
+        assert fixed == fix_text(TEST_TEXT, **options)
+
+    text = 'Nothing to fix here.\n' * 10
+    assert asyncio.run(aio.fix_text(text, slice_size=20)) is text
+
+
+@pytest.mark.parametrize("slice_size", [1, 100, 2 ** 16])
+def test_fix_text_other_line_breaks(slice_size):
+    for line_break in ['\r', '\r\n', '\u2028']:
+        text = TEST_TEXT.replace('\n', line_break)
+        slices = list(aio._slices(text, slice_size))
+        assert ''.join(slices) == text
+        longest_line = max(len(case['original']) for case in TEST_DATA) + 2
+        assert all(len(piece) <= slice_size + longest_line for piece in slices)
+        fixed = asyncio.run(aio.fix_text(text, slice_size=slice_size))
+        assert fixed == fix_text(text)
+        options = {'fix_line_breaks': False}
+        fixed = asyncio.run(aio.fix_text(text, slice_size=slice_size, **options))
+        assert fixed == fix_text(text, **options)
+
+
+def test_fix_text_entities_after_html():
+    text = '&lt;3\n<b>&lt;3</b>\n&lt;3\n'
+    assert asyncio.run(aio.fix_text(text, slice_size=1)) == fix_text(text)
+
+
+def test_fix_text_executor():
+    with ThreadPoolExecutor(2) as executor:
+        fixed = asyncio.run(aio.fix_text(TEST_TEXT, executor=executor, slice_size=100))
+    assert fixed == fix_text(TEST_TEXT)
+
+
+@pytest.mark.parametrize("size", [1, 7, 2 ** 16])
+def test_fix_file(size):
+    data = TEST_TEXT.encode('utf-8')
+    expected = list(fix_file(io.BytesIO(data)))
+    fixed = asyncio.run(collect(aio.fix_file(ChunkReader(data), buffer_size=size)))
+    assert fixed == expected
+    fixed = asyncio.run(collect(aio.fix_file(iterate_chunks(data, size), block_size=3)))
+    assert fixed == expected
+
+
+def test_fix_file_text_and_encoding():
+    expected = list(fix_file(io.StringIO(TEST_TEXT)))
+    fixed = asyncio.run(collect(aio.fix_file(iterate_chunks(TEST_TEXT, 10))))
+    assert fixed == expected
+
+    data = 'caf\xe9 &amp; cr\xe8me\n'.encode('latin-1')
+    fixed = asyncio.run(collect(aio.fix_file(ChunkReader(data), 'latin-1')))
+    assert fixed == ['café & crème\n']
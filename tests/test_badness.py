@@ -0,0 +1,66 @@
+from ftfy.badness import (
+    COMMON_SYMBOL_RE,
+    MOJIBAKE_SYMBOL_RE,
+    WEIRDNESS_RE,
+    segmented_text_cost,
+    sequence_weirdness,
+    text_cost,
+)
+from ftfy.chardata import chars_to_classes
+import json
+import os
+import random
+import unicodedata
+
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, 'test_cases.json')
+TEST_DATA = json.load(open(TEST_FILENAME, encoding='utf-8'))
+
+
+def reference_weirdness(text):
+    # The straightforward way to compute sequence_weirdness, which the
+    # optimized version must agree with exactly
+    text2 = unicodedata.normalize('NFC', text)
+    weirdness = len(WEIRDNESS_RE.findall(chars_to_classes(text2)))
+    adjustment = len(MOJIBAKE_SYMBOL_RE.findall(text2)) * 2 - len(
+        COMMON_SYMBOL_RE.findall(text2)
+    )
+    return weirdness * 2 + adjustment
+
+
+def test_cost_matches_reference():
+    for case in TEST_DATA:
+        for text in (case['original'], case['fixed']):
+            assert sequence_weirdness(text) == reference_weirdness(text)
+            assert text_cost(text) == reference_weirdness(text) + len(text)
+
+
+def test_weirdness_matches_reference_on_random_text():
+    # Make strings out of characters that ftfy finds interesting, including
+    # ones from every character class, so that all the patterns get a workout
+    rng = random.Random(0)
+    alphabet = (
+        'aZ \t\x00\x7f1^¨´×ß°™…—“”«»\xa0\ufeffÂÃÎÐÑØĂĐŘ¬√◊ðđâвЂ€\x81\x9f'
+        'e\u0301\u0300ʼˈʰ½²ǂɐ漢カαΩДжאا\ud800\ue000\u0378\U000e0001'
+    )
+    for _ in range(20000):
+        length = rng.randrange(12)
+        text = ''.join(rng.choice(alphabet) for _ in range(length))
+        assert sequence_weirdness(text) == reference_weirdness(text), text
+
+
+def test_segmented_cost():
+    # Long strings made of test cases, separated by various amounts of ASCII,
+    # have the same cost when they're split into segments
+    rng = random.Random(0)
+    texts = [case['original'] for case in TEST_DATA] + [
+        case['fixed'] for case in TEST_DATA
+    ]
+    separators = ['', ' ', 'ab', ' plain words ', '\x01\x7f ascii controls\x1b ']
+    cache = {}
+    for _ in range(100):
+        pieces = [rng.choice(texts) for _ in range(rng.randrange(1, 100))]
+        text = ''.join(piece + rng.choice(separators) for piece in pieces)
+        assert segmented_text_cost(text, cache) == text_cost(text)
+        assert segmented_text_cost(text, {}) == text_cost(text)
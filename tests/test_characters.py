@@ -1,11 +1,16 @@
 from ftfy.fixes import (
-    fix_encoding, fix_encoding_and_explain, apply_plan, possible_encoding,
-    remove_control_chars, fix_surrogates
+    fix_encoding, fix_encoding_and_explain, apply_plan,
+    remove_control_chars, fix_surrogates, make_character_fixer, CHARACTER_FIXES
 )
 from ftfy.badness import sequence_weirdness
+from ftfy import chardata
+from ftfy.chardata import ENCODING_BITS, possible_encoding, possible_encodings
+import pytest
+import random
+import subprocess
 import unicodedata
 import sys
-from ftfy.char_classes import CHAR_CLASS_STRING
+from ftfy.chardata import CHAR_CLASS_STRING, chars_to_classes
 
 
 # Most single-character strings which have been misencoded should be restored.
@@ -31,6 +36,20 @@ def test_possible_encoding():
         assert possible_encoding(char, 'latin-1')
 
 
+def test_possible_encodings():
+    # The bitmask agrees with possible_encoding for every encoding
+    rng = random.Random(0)
+    chars = [chr(codept) for codept in range(0x800)] + ['\ufffd', '\u2022', '漢']
+    texts = [''] + chars
+    for _ in range(2000):
+        length = rng.randrange(1, 8)
+        texts.append(''.join(rng.choice(chars) for _ in range(length)))
+    for text in texts:
+        mask = possible_encodings(text)
+        for encoding, bit in ENCODING_BITS.items():
+            assert bool(mask & bit) == possible_encoding(text, encoding), (text, encoding)
+
+
 def test_byte_order_mark():
     assert fix_encoding('ï»¿') == '\ufeff'
 
@@ -63,3 +82,58 @@ def test_surrogates():
 
 def test_char_class_type():
     assert isinstance(CHAR_CLASS_STRING, str)
+
+
+def test_chars_to_classes():
+    # The compact table gives the same classes as the full string, including
+    # for characters outside the BMP
+    rng = random.Random(0)
+    for _ in range(100):
+        codepts = [rng.randrange(0x110000) for _ in range(50)]
+        if rng.random() < 0.5:
+            codepts = [codept & 0xffff for codept in codepts]
+        text = ''.join(map(chr, codepts))
+        assert chars_to_classes(text) == ''.join(CHAR_CLASS_STRING[c] for c in codepts)
+    assert chars_to_classes('Ab 漢 🎅🏿\U000e0001') == 'Ll C 33o'
+
+
+def test_tables_are_built_when_needed():
+    # Importing ftfy doesn't build the character tables, or import modules
+    # that only some functions need
+    code = (
+        'import sys, ftfy; '
+        'print(sorted(set(sys.modules) & {"ftfy.char_classes", "multiprocessing", "wcwidth"})); '
+        'print(sorted(set(vars(ftfy.chardata)) & set(ftfy.chardata._LAZY_TABLES)))'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode('utf-8').split() == ['[]', '[]']
+
+    # The tables are attributes of chardata that are built when they're used
+    assert len(chardata.CHAR_CLASS_STRING) == 0x110000
+    assert chardata.HTML_ENTITIES['&NTILDE;'] == 'Ñ'
+    assert chardata.WIDTH_MAP[0xff21] == 'A'
+    assert chardata.ENCODING_REGEXES['latin-1'].match('Ã©')
+    assert chardata.ENCODING_MASKS['é'] & ENCODING_BITS['latin-1']
+    with pytest.raises(AttributeError):
+        chardata.NOT_A_TABLE
+
+
+def test_combined_character_fixes():
+    # Combining the character fixes into one translation table should give
+    # the same result as applying them one at a time, for any subset of them.
+    names = list(CHARACTER_FIXES)
+    text = ''.join(
+        chr(codept) for codept in range(0x10000) if not 0xd800 <= codept < 0xe000
+    ) + '\r\n\r\r\n'
+    for mask in range(1 << len(names)):
+        subset = tuple(name for i, name in enumerate(names) if mask & (1 << i))
+        expected = text
+        for name in subset:
+            expected = CHARACTER_FIXES[name](expected)
+        fixer = make_character_fixer(subset)
+        if fixer is None:
+            assert subset == ()
+        else:
+            assert fixer(text) == expected
+            # TextFixer relies on the combined fixes being idempotent
+            assert fixer(expected) == expected
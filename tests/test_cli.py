@@ -62,3 +62,24 @@ def test_stdin():
         output = get_command_output(['ftfy'], stdin=infile)
         assert output == CORRECT_OUTPUT
 
+
+def test_parallel_cli():
+    output = get_command_output(['ftfy', '-j', '2', TEST_FILENAME])
+    assert output == CORRECT_OUTPUT
+    with pytest.raises(subprocess.CalledProcessError) as exception:
+        get_command_output(['ftfy', '-j', '2', '-e', 'windows-1252', TEST_FILENAME])
+    assert exception.value.output.decode('utf-8') == FAILED_OUTPUT
+
+
+def test_profile():
+    result = subprocess.run(
+        ['ftfy', '--profile', TEST_FILENAME],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=5,
+        check=True,
+    )
+    assert result.stdout.decode('utf-8') == CORRECT_OUTPUT
+    profile = result.stderr.decode('utf-8')
+    assert profile.startswith('step')
+    assert 'fix_encoding' in profile
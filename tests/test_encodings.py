@@ -1,4 +1,7 @@
 from ftfy import bad_codecs, guess_bytes
+import codecs
+import io
+import pytest
 
 
 def test_cesu8():
@@ -12,6 +15,63 @@ def test_cesu8():
     assert test_bytes.decode('cesu8') == test_text
 
 
+def test_cesu8_many_sequences():
+    # Input with a special sequence every few bytes decodes the same whether
+    # it arrives all at once or in pieces
+    test_bytes = b'\xed\xa0\xbd\xed\xb8\x8d \xc0\x80 \xed\xa0\x80 ok ' * 1000
+    test_text = '\U0001f60d \x00 \ufffd\ufffd\ufffd ok ' * 1000
+    assert test_bytes.decode('utf-8-variants', 'replace') == test_text
+
+    for size in [1, 5, 64]:
+        decoder = codecs.getincrementaldecoder('utf-8-variants')('replace')
+        pieces = [
+            decoder.decode(test_bytes[start:start + size])
+            for start in range(0, len(test_bytes), size)
+        ]
+        pieces.append(decoder.decode(b'', final=True))
+        assert ''.join(pieces) == test_text
+
+
+codecs.register_error('null-for-test', lambda err: (b'\x00', err.end))
+
+
+@pytest.mark.parametrize("encoding", ['cesu-8', 'cesu8', 'java-utf-8', 'java_utf8'])
+def test_encode_utf8_variants(encoding):
+    text = 'Null: \x00, emoji: \U0001f60d, BMP: é 漢, last: \U0010ffff'
+    expected = (
+        b'Null: \x00, emoji: \xed\xa0\xbd\xed\xb8\x8d, '
+        b'BMP: \xc3\xa9 \xe6\xbc\xa2, last: \xed\xaf\xbf\xed\xbf\xbf'
+    )
+    if encoding.startswith('java'):
+        expected = expected.replace(b'\x00', b'\xc0\x80')
+    assert text.encode(encoding) == expected
+    assert expected.decode(encoding) == text
+
+    encoder = codecs.getincrementalencoder(encoding)()
+    assert b''.join(encoder.encode(char) for char in text) == expected
+
+    stream = io.BytesIO()
+    codecs.getwriter(encoding)(stream).write(text)
+    assert stream.getvalue() == expected
+    assert codecs.getreader(encoding)(io.BytesIO(expected)).read() == text
+
+    # Errors are handled like the UTF-8 codec would
+    with pytest.raises(UnicodeEncodeError):
+        'lone \ud800 surrogate'.encode(encoding)
+    assert 'lone \ud800'.encode(encoding, 'surrogatepass') == b'lone \xed\xa0\x80'
+
+    # Bytes that come from the error handler are left as they are
+    raw = b'\xf0\x9f\x98\x8d\xff'
+    escaped = raw.decode('ascii', 'surrogateescape') + ' \U0001f60d\x00'
+    null = b'\xc0\x80' if encoding.startswith('java') else b'\x00'
+    encoded = escaped.encode(encoding, 'surrogateescape')
+    assert encoded == raw + b' \xed\xa0\xbd\xed\xb8\x8d' + null
+    assert 'a\ud800\x00'.encode(encoding, 'null-for-test') == b'a\x00' + null
+
+    # 'utf-8-variants' still encodes as standard UTF-8
+    assert text.encode('utf-8-variants') == text.encode('utf-8')
+
+
 def test_russian_crash():
     thebytes = b'\xe8\xed\xe2\xe5\xed\xf2\xe0\xf0\xe8\xe7\xe0\xf6\xe8\xff '
     # We don't care what the result is, but this shouldn't crash
@@ -0,0 +1,371 @@
+from ftfy import (
+    TextFixer,
+    fix_file,
+    fix_text,
+    fix_text_and_explain,
+    fix_text_edits,
+    fix_text_segment,
+    fix_texts,
+    fix_texts_deduplicated,
+)
+from ftfy.caching import PlanCache, SegmentCache
+from ftfy.fixes import fix_encoding_and_explain
+import io
+import json
+import multiprocessing
+import os
+import pytest
+import subprocess
+import sys
+
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, 'test_cases.json')
+TEST_DATA = json.load(open(TEST_FILENAME, encoding='utf-8'))
+
+
+CLEAN_TEXTS = [
+    'Plain ASCII text, with numbers 123 and punctuation!\n',
+    'S&P 500 & friends',
+    'Ça va? Ñandú, schön, ßtraße, 漢字, (кириллица) 🎅🏿\n',
+    '',
+]
+
+UNCLEAN_TEXTS = [
+    'An &amp; entity',
+    'A \x1b[36mcolored\x1b[0m word',
+    'Windows line break\r\n',
+    'Control\x00 character',
+    'Mojibake: schÃ¶n',
+    'Not normalized: é',
+    '﻿Byte order mark',
+]
+
+
+@pytest.mark.parametrize("text", CLEAN_TEXTS)
+def test_clean_text_is_returned_as_is(text):
+    fixer = TextFixer()
+    assert fixer.fix_text(text) is text
+    assert fixer.fix_text_segment(text) is text
+    assert fix_text(text) is text
+
+
+@pytest.mark.parametrize("text", UNCLEAN_TEXTS)
+def test_unclean_text_is_fixed(text):
+    assert fix_text(text) != text
+
+
+def test_fast_path_respects_options():
+    text = 'An &amp; entity'
+    assert TextFixer(fix_entities=False).fix_text(text) is text
+    text = 'Not normalized: é'
+    assert TextFixer(normalization=None).fix_text(text) is text
+
+
+def test_fix_texts():
+    texts = [case['original'] for case in TEST_DATA] * 3
+    expected = [fix_text(text) for text in texts]
+    assert list(fix_texts(texts, workers=1)) == expected
+    assert list(fix_texts(iter(texts), workers=2, chunksize=7)) == expected
+    assert list(fix_texts([], workers=2)) == []
+
+
+def test_fix_texts_options():
+    texts = ['&lt;3 “quotes”', 'schÃ¶n'] * 10
+    expected = [fix_text(text, uncurl_quotes=False) for text in texts]
+    assert list(fix_texts(texts, workers=2, uncurl_quotes=False)) == expected
+
+
+@pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+def test_fix_texts_shared_tables(start_method):
+    # The workers get the same results with tables from this process, however
+    # they're started
+    code = (
+        'import multiprocessing, ftfy; '
+        'multiprocessing.set_start_method({!r}); '
+        'texts = ["&lt;3 “quotes”", "schÃ¶n", "ＬＯＵＤ"] * 10; '
+        'fixed = ftfy.fix_texts(texts, workers=2, chunksize=3, shared_tables=True); '
+        'print(list(fixed) == [ftfy.fix_text(text) for text in texts])'
+    ).format(start_method)
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.split() == [b'True']
+
+
+@pytest.mark.skipif(
+    'forkserver' not in multiprocessing.get_all_start_methods(),
+    reason="needs the forkserver start method",
+)
+def test_fix_texts_shared_tables_forkserver():
+    # The forkserver builds the tables, so a worker it forks has them before
+    # it's set up to fix anything
+    code = (
+        'import multiprocessing, ftfy; '
+        'multiprocessing.set_start_method("forkserver"); '
+        'list(ftfy.fix_texts(["schÃ¶n"] * 2, workers=2, shared_tables=True)); '
+        'pool = multiprocessing.Pool(1); '
+        'print(pool.apply(eval, ["len(__import__(\'ftfy\').chardata._TABLES)"])); '
+        'pool.terminate()'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert int(output) > 0
+
+
+def test_fix_texts_deduplicated():
+    originals = [case['original'] for case in TEST_DATA]
+    texts = originals * 3 + originals[:10]
+    fixed, stats = fix_texts_deduplicated(texts)
+    assert fixed == [fix_text(text) for text in texts]
+    assert stats.total == len(texts)
+    assert stats.distinct == len(set(originals))
+    assert stats.ratio == len(texts) / len(set(originals))
+
+    fixed, stats = fix_texts_deduplicated(iter(texts), workers=2, normalization='NFKC')
+    assert fixed == [fix_text(text, normalization='NFKC') for text in texts]
+
+    assert fix_texts_deduplicated([]) == ([], (0, 0))
+
+
+def test_segment_cache():
+    cache = SegmentCache()
+    texts = [case['original'] for case in TEST_DATA]
+    for _ in range(2):
+        for text in texts:
+            assert fix_text(text, segment_cache=cache) == fix_text(text)
+            assert fix_text(text, uncurl_quotes=False, segment_cache=cache) == (
+                fix_text(text, uncurl_quotes=False)
+            )
+    info = cache.info()
+    assert info.hits > 0
+    assert info.misses == info.entries
+    assert info.evictions == 0
+
+
+def test_segment_cache_bounds():
+    cache = SegmentCache(max_entries=2, max_length=10)
+    for text in ['&amp;1', '&amp;2', '&amp;3', '&amp;3']:
+        fix_text_segment(text, segment_cache=cache)
+    assert cache.info() == (1, 3, 1, 2, 16)
+
+    fix_text_segment('&amp;' * 10, segment_cache=cache)
+    assert cache.info() == (1, 3, 1, 2, 16)
+
+    cache = SegmentCache(max_chars=20)
+    for text in ['&amp;1', '&amp;2', '&amp;3']:
+        fix_text_segment(text, segment_cache=cache)
+    assert cache.info().evictions == 1
+    assert cache.info().size == 16
+
+
+def test_segment_cache_in_workers():
+    cache = SegmentCache()
+    texts = ['schÃ¶n'] * 10
+    assert list(fix_texts(texts, workers=2, segment_cache=cache)) == ['schön'] * 10
+
+
+def test_plan_cache():
+    cache = PlanCache()
+    texts = [case['original'] for case in TEST_DATA]
+    for _ in range(2):
+        for text in texts:
+            assert fix_text(text, plan_cache=cache) == fix_text(text)
+    info = cache.info()
+    assert info.hits > 0
+    assert 0 < info.entries <= info.misses
+
+
+def test_plan_cache_rejects_bad_plans():
+    cache = PlanCache()
+    plan = [('encode', 'latin-1', 0), ('decode', 'utf-8', 0)]
+    assert fix_encoding_and_explain('cafÃ©', cache) == ('café', plan)
+    assert fix_encoding_and_explain('crÃ©Ã©', cache) == ('créé', plan)
+    assert cache.info().hits == 1
+
+    # This has the same signature, but the plan doesn't work on it
+    assert fix_encoding_and_explain('Ã©Ã', cache) == ('Ã©Ã', [])
+    assert cache.rejected == 1
+    assert len(cache) == 1
+
+
+def test_propagate_plans():
+    # The second line doesn't have enough mojibake to be fixed right by
+    # itself, but the first line shows how the text was broken
+    text = 'Crème brûlée, façade, naïve café, Größe\n« Bonjour »\n'
+    broken = text.encode('utf-8').decode('iso-8859-2')
+    assert fix_text(broken, propagate_plans=True) == text
+    lines = broken.splitlines(keepends=True)
+    assert ''.join(fix_file(lines, propagate_plans=True)) == text
+    data = io.BytesIO(text.encode('utf-8'))
+    assert ''.join(fix_file(data, 'iso-8859-2', propagate_plans=True)) == text
+
+    fixed = fix_text(broken)
+    assert fixed == 'Crème brûlée, façade, naïve café, Größe\nÂŤ Bonjour Âť\n'
+
+
+def test_propagate_plans_only_when_better():
+    # A plan is only used on later lines that it improves by more than it
+    # costs, and the lines it's used on can be fixed further
+    options = {'propagate_plans': True}
+    assert fix_text('schÃ¶n\nüber\nnaÃ¯ve\n', **options) == 'schön\nüber\nnaïve\n'
+    text = 'РґРѕСЂРѕРіРµ\nВІКІ is Ukrainian for WIKI'
+    assert fix_text(text, **options) == 'дороге\nВІКІ is Ukrainian for WIKI'
+    text = 'âœ” No problems\nThe Mona Lisa doesnÃƒÂ¢Ã¢â€šÂ¬Ã¢â€žÂ¢t have eyebrows.'
+    assert fix_text(text, **options) == "✔ No problems\nThe Mona Lisa doesn't have eyebrows."
+
+
+MOJIBAKE_LINES = [
+    'Crème brûlée, façade, naïve café, Größe'.encode('utf-8').decode(encoding)
+    for encoding in [
+        'latin-1', 'sloppy-windows-1252', 'sloppy-windows-1250', 'iso-8859-2',
+        'sloppy-windows-1251', 'macroman', 'cp437',
+    ]
+]
+
+
+@pytest.mark.parametrize("line", MOJIBAKE_LINES)
+def test_propagate_plans_keeps_good_fixes(line):
+    # A plan from a line before doesn't make any test case come out worse
+    for case in TEST_DATA:
+        if case['expect'] == 'pass':
+            fixed = fix_text(line + '\n' + case['original'], propagate_plans=True)
+            assert fixed == fix_text(line) + '\n' + case['fixed']
+
+
+def test_fix_encoding_spans():
+    # Fixing spans gets everything right that fixing whole lines does
+    for case in TEST_DATA:
+        if case['expect'] == 'pass':
+            assert fix_text(case['original'], fix_encoding='spans') == case['fixed']
+
+    # and it can fix lines where one plan doesn't work for everything
+    text = 'Un café, ou un cafÃ©? 漢字, le thÃ©\n'
+    assert fix_text(text) == text
+    fixed = fix_text(text, fix_encoding='spans')
+    assert fixed == 'Un café, ou un café? 漢字, le thé\n'
+
+
+def test_long_lines_are_fixed_in_pieces():
+    piece = '{"word": "schÃ¶n", "n": 1}, &lt;3 naÃ¯ve '
+    text = piece * 100 + '\n'
+    expected = fix_text(text)
+    assert expected == '{"word": "schön", "n": 1}, <3 naïve ' * 100 + '\n'
+    for max_decode_length in [10, 30, 1000]:
+        assert fix_text(text, max_decode_length=max_decode_length) == expected
+
+    # Text that can't be split small enough doesn't get its encoding fixed
+    assert fix_text('schÃ¶n schÃ¶n', max_decode_length=6) == 'schÃ¶n schön'
+
+
+@pytest.mark.parametrize("linebreak", ['\n', '\r\n', '\r', '\u2028', '\u2029'])
+def test_lines_end_with_any_line_break(linebreak):
+    # Each line is fixed separately, so the first line can be fixed even
+    # though the second line can't be decoded the same way
+    text = linebreak.join(['schÃ¶n', 'Ã¼ber ✔', ''])
+    assert fix_text(text) == 'schön\nÃ¼ber ✔\n'
+
+
+@pytest.mark.parametrize("options", [{}, {'propagate_plans': False}, {'fix_encoding': 'spans'}])
+def test_fix_text_and_explain(options):
+    for case in TEST_DATA:
+        text = case['original']
+        fixed, explanation = fix_text_and_explain(text, **options)
+        assert fixed == fix_text(text, **options)
+        if fixed == text:
+            assert explanation == []
+        else:
+            assert [line for line, _ in explanation] == [0]
+
+    text = 'schÃ¶n\n&lt;3\nok\r\n'
+    fixed, explanation = fix_text_and_explain(text, **options)
+    assert fixed == 'schön\n<3\nok\n'
+    plan = None
+    if options.get('fix_encoding') != 'spans':
+        plan = (('encode', 'latin-1', 0), ('decode', 'utf-8', 0))
+    assert explanation == [
+        (0, [('fix_encoding', plan)]),
+        (1, [('unescape_html', None)]),
+        (2, [('fix_characters', None)]),
+    ]
+
+
+def apply_edits(text, edits):
+    for start, end, replacement in reversed(edits):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def test_fix_text_edits():
+    for case in TEST_DATA:
+        text = case['original']
+        edits = fix_text_edits(text)
+        assert apply_edits(text, edits) == fix_text(text)
+        assert (edits == []) == (fix_text(text) == text)
+
+    text = ''.join(case['original'] + '\n' for case in TEST_DATA)
+    edits = fix_text_edits(text, max_decode_length=20)
+    assert apply_edits(text, edits) == fix_text(text, max_decode_length=20)
+    assert all(end <= start for (_, end, _), (start, _, _) in zip(edits, edits[1:]))
+
+    for text in CLEAN_TEXTS:
+        assert fix_text_edits(text) == []
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 2 ** 16])
+def test_fix_file_blocks(buffer_size):
+    text = ''.join(case['original'] + '\n' for case in TEST_DATA)
+    expected = ''.join(fix_file(text.splitlines(keepends=True)))
+    for encoding in ['utf-8', None]:
+        fixed = fix_file(io.BytesIO(text.encode('utf-8')), encoding, buffer_size=buffer_size)
+        assert ''.join(fixed) == expected
+
+    data = 'ol\xe9\nna\xefve\r\n'.encode('sloppy-windows-1252')
+    fixed = fix_file(io.BytesIO(data), 'sloppy-windows-1252', buffer_size=buffer_size)
+    assert list(fixed) == ['olé\n', 'naïve\n']
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 2 ** 16])
+def test_fix_file_other_line_breaks(buffer_size):
+    text = ''.join(case['original'] + '\r' for case in TEST_DATA)
+    expected = fix_text(text)
+    for encoding in ['utf-8', None]:
+        stream = io.BytesIO(text.encode('utf-8'))
+        fixed = list(fix_file(stream, encoding, buffer_size=buffer_size))
+        assert ''.join(fixed) == expected
+        assert all(line.endswith('\n') for line in fixed)
+
+    # A CR-only file is fixed as it's read, not all at the end
+    data = text.encode('utf-8') * 100
+    stream = io.BytesIO(data)
+    next(fix_file(stream, buffer_size=buffer_size))
+    assert stream.tell() < len(data)
+
+    # A CRLF that's split between blocks is still one line break
+    data = 'café\r\nnaïve\r\u2028x'.encode('utf-8')
+    fixed = fix_file(io.BytesIO(data), 'utf-8', buffer_size=buffer_size, fix_line_breaks=False)
+    assert list(fixed) == ['café\r\n', 'naïve\r', '\u2028', 'x']
+
+
+def test_fix_file_decode_error():
+    data = b'one\ntwo\nthr\xffee\nfour\n'
+    fixed = []
+    with pytest.raises(UnicodeDecodeError):
+        for line in fix_file(io.BytesIO(data), 'utf-8', buffer_size=6):
+            fixed.append(line)
+    assert fixed == ['one\n', 'two\n']
+
+
+def test_fix_file_workers():
+    # Fix the file in small blocks, with HTML partway through, and check that
+    # the lines come out in order and the same as fixing it in one process.
+    lines = [case['original'] + '\n' for case in TEST_DATA]
+    lines = lines[:20] + ['<b>&amp;</b>\n'] + ['&lt;3\n'] * 20 + lines[20:]
+    data = ''.join(lines).encode('utf-8')
+    expected = list(fix_file(io.BytesIO(data), 'utf-8', buffer_size=100))
+    fixed = list(fix_file(io.BytesIO(data), 'utf-8', buffer_size=100, workers=2))
+    assert fixed == expected
+
+    data = b'one\ntwo\nthr\xffee\nfour\n'
+    fixed = []
+    with pytest.raises(UnicodeDecodeError):
+        for line in fix_file(io.BytesIO(data), 'utf-8', buffer_size=6, workers=2):
+            fixed.append(line)
+    assert fixed == ['one\n', 'two\n']
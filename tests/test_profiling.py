@@ -0,0 +1,43 @@
+from ftfy import TextFixer, fix_text
+from ftfy.profiling import Profile
+import json
+import os
+
+
+THIS_DIR = os.path.dirname(__file__)
+TEST_FILENAME = os.path.join(THIS_DIR, 'test_cases.json')
+TEST_DATA = json.load(open(TEST_FILENAME, encoding='utf-8'))
+
+
+def test_profile_counts():
+    texts = [case['original'] for case in TEST_DATA]
+    with Profile() as profile:
+        fixed = [fix_text(text) for text in texts]
+    assert fixed == [fix_text(text) for text in texts]
+
+    steps = profile.steps
+    assert set(steps) <= {
+        'remove_terminal_escapes',
+        'fix_encoding',
+        'unescape_html',
+        'fix_surrogates',
+        'fix_characters',
+        'normalization',
+    }
+    assert steps['fix_encoding'].changed > 0
+    assert steps['fix_encoding'].chars_changed > 0
+    for stats in steps.values():
+        assert stats.changed <= stats.calls
+        assert stats.time >= 0
+    assert profile.segments <= profile.passes
+    assert len(profile.summary().splitlines()) == len(steps) + 2
+
+
+def test_profile_is_only_active_inside_with():
+    profile = Profile()
+    fix_text('schÃ¶n')
+    with profile:
+        TextFixer().fix_text_segment('schÃ¶n')
+    fix_text('schÃ¶n')
+    assert profile.segments == 1
+    assert profile.steps['fix_encoding'].calls == 1